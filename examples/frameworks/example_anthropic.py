@@ -1,18 +1,21 @@
 """ez-ptc + Anthropic — Tool mode example.
 
 Uses toolkit.as_tool() and toolkit.tool_schema(format="anthropic") to
-register a single meta-tool with Anthropic's messages API.
+register a single meta-tool with Anthropic's messages API. Responses are
+streamed so each tool_use block starts executing as soon as it is complete.
 
-Also shows the difference between assist_tool_chaining=True and False.
+Pass --compare to also show the difference between assist_tool_chaining=True
+and False.
 
 Usage:
-    uv run python examples/frameworks/example_anthropic.py
+    uv run python examples/frameworks/example_anthropic.py [--compare]
 
 Requires:
     ANTHROPIC_API_KEY in .env or environment
     pip install anthropic
 """
 
+import asyncio
 import sys
 from pathlib import Path
 
@@ -20,84 +23,103 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from dotenv import load_dotenv
 
-from shared_tools import USER_PROMPT, toolkit, toolkit_basic
+from shared_tools import (
+    USER_PROMPT,
+    console,
+    history_messages,
+    indent,
+    new_history,
+    print_comparison,
+    toolkit,
+)
 
 load_dotenv()
 
 
-def main():
+async def main():
     import anthropic
 
-    # ── Compare: with vs without tool chaining ──────────────────────
-    print("=" * 60)
-    print("COMPARISON: Tool schema description sent to the LLM")
-    print("=" * 60)
+    # ── Compare: with vs without tool chaining (--compare) ──────────
+    if "--compare" in sys.argv:
+        from shared_tools import BASIC_DESC, CHAINED_DESC
 
-    basic_desc = toolkit_basic.tool_schema(format="anthropic")["description"]
-    chained_desc = toolkit.tool_schema(format="anthropic")["description"]
-
-    print("\n--- Without assist_tool_chaining ---")
-    print(basic_desc)
-
-    print("\n--- With assist_tool_chaining ---")
-    print(chained_desc)
-
-    print("\n" + "=" * 60)
-    print("The chaining-enabled version includes 'Returns: {...}' hints")
-    print("so the LLM knows the exact shape of each tool's output.")
-    print("=" * 60 + "\n")
+        print_comparison("Tool schema description sent to the LLM", BASIC_DESC, CHAINED_DESC)
 
     # ── Main flow: uses the chaining-enabled toolkit ────────────────
-    client = anthropic.Anthropic()
+    client = anthropic.AsyncAnthropic()
     tool_schema = toolkit.tool_schema(format="anthropic")
-    execute_fn = toolkit.as_tool_sync()
+    execute_fn = toolkit.as_tool()  # async callable
+    system_prompt = f"You are a helpful assistant.\n\n{toolkit.tool_prompt()}"
 
-    messages = [
+    pinned = [
         {"role": "user", "content": USER_PROMPT},
     ]
+    turns = new_history()
 
     print(f"User: {USER_PROMPT}\n")
 
-    # Agentic loop
+    # Blocks run one after another: execute_code() captures output by
+    # redirecting the process-wide sys.stdout, so concurrent blocks would
+    # mix their prints. Concurrency belongs inside a block, via the
+    # parallel() helper the tool prompt advertises.
+    exec_lock = asyncio.Lock()
+
+    async def run_block(code: str) -> str:
+        async with exec_lock:
+            return await execute_fn(code)
+
+    # Agentic loop — stream each response and start executing a tool_use
+    # block as soon as it closes, while the rest is still being generated
     for turn in range(10):
-        response = client.messages.create(
-            model="claude-sonnet-4-5-20250514",
-            max_tokens=4096,
-            system=f"You are a helpful assistant.\n\n{toolkit.tool_prompt()}",
-            tools=[tool_schema],
-            messages=messages,
-        )
+        pending = []  # (tool_use_id, task) in block order
+        try:
+            async with client.messages.stream(
+                model="claude-sonnet-4-5-20250514",
+                max_tokens=4096,
+                system=system_prompt,
+                tools=[tool_schema],
+                messages=history_messages(pinned, turns),
+            ) as stream:
+                async for event in stream:
+                    if event.type == "content_block_stop" and event.content_block.type == "tool_use":
+                        block = event.content_block
+                        code = block.input.get("code", "")
+                        console(f"[Tool call] execute_tools(code=...)")
+                        console(f"  Code:\n{indent(code)}")
+                        pending.append((block.id, asyncio.create_task(run_block(code))))
+                response = await stream.get_final_message()
+        except BaseException:
+            # Let blocks that already started finish before the error
+            # propagates, rather than abandoning them mid-execution
+            await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+            raise
 
         if response.stop_reason == "tool_use":
-            messages.append({"role": "assistant", "content": response.content})
-
             tool_results = []
-            for block in response.content:
-                if block.type == "tool_use":
-                    code = block.input.get("code", "")
-                    print(f"[Tool call] execute_tools(code=...)")
-                    print(f"  Code:\n{_indent(code)}")
-
-                    result = execute_fn(code)
-                    print(f"  Result:\n{_indent(result)}\n")
-
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": block.id,
-                        "content": result,
-                    })
-
-            messages.append({"role": "user", "content": tool_results})
+            for tool_use_id, task in pending:
+                result = await task
+                console(f"  Result:\n{indent(result)}\n")
+
+                tool_results.append({
+                    "type": "tool_result",
+                    "tool_use_id": tool_use_id,
+                    "content": result,
+                })
+
+            turns.append([
+                {"role": "assistant", "content": response.content},
+                {"role": "user", "content": tool_results},
+            ])
         else:
+            # A tool_use block may have closed before the response stopped
+            # for another reason (e.g. max_tokens); its result goes unused,
+            # but let it finish instead of being cancelled mid-run
+            await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
             for block in response.content:
-                if hasattr(block, "text"):
+                if block.type == "text":
                     print(f"Assistant: {block.text}")
             break
 
 
-def _indent(text: str, prefix: str = "    ") -> str:
-    return "\n".join(f"{prefix}{line}" for line in text.strip().split("\n"))
-
-
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
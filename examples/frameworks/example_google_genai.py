@@ -3,16 +3,18 @@
 Uses toolkit.as_tool() with the google-genai SDK to register
 a single meta-tool with Gemini's function calling.
 
-Also shows the difference between assist_tool_chaining=True and False.
+Pass --compare to also show the difference between assist_tool_chaining=True
+and False.
 
 Usage:
-    uv run python examples/frameworks/example_google_genai.py
+    uv run python examples/frameworks/example_google_genai.py [--compare]
 
 Requires:
     GOOGLE_API_KEY in .env or environment
     pip install google-genai
 """
 
+import asyncio
 import sys
 from pathlib import Path
 
@@ -20,38 +22,25 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from dotenv import load_dotenv
 
-from shared_tools import USER_PROMPT, toolkit, toolkit_basic
+from shared_tools import USER_PROMPT, indent, print_comparison, toolkit
 
 load_dotenv()
 
 
-def main():
+async def main():
     from google import genai
     from google.genai import types
     from google.genai.types import FunctionDeclaration, Tool as GenaiTool
 
-    # ── Compare: with vs without tool chaining ──────────────────────
-    print("=" * 60)
-    print("COMPARISON: Tool schema description sent to the LLM")
-    print("=" * 60)
+    # ── Compare: with vs without tool chaining (--compare) ──────────
+    if "--compare" in sys.argv:
+        from shared_tools import BASIC_DESC, CHAINED_DESC
 
-    basic_desc = toolkit_basic.tool_schema()["function"]["description"]
-    chained_desc = toolkit.tool_schema()["function"]["description"]
-
-    print("\n--- Without assist_tool_chaining ---")
-    print(basic_desc)
-
-    print("\n--- With assist_tool_chaining ---")
-    print(chained_desc)
-
-    print("\n" + "=" * 60)
-    print("The chaining-enabled version includes 'Returns: {...}' hints")
-    print("so the LLM knows the exact shape of each tool's output.")
-    print("=" * 60 + "\n")
+        print_comparison("Tool schema description sent to the LLM", BASIC_DESC, CHAINED_DESC)
 
     # ── Main flow: uses the chaining-enabled toolkit ────────────────
     client = genai.Client()
-    execute_fn = toolkit.as_tool_sync()
+    execute_fn = toolkit.as_tool()  # async callable
 
     # Google GenAI doesn't accept raw OpenAI-format schemas — we extract
     # the fields from tool_schema() and build a FunctionDeclaration manually.
@@ -78,7 +67,7 @@ def main():
 
     # Agentic loop
     for turn in range(10):
-        response = client.models.generate_content(
+        response = await client.aio.models.generate_content(
             model="gemini-2.0-flash",
             contents=contents,
             config=config,
@@ -96,10 +85,10 @@ def main():
                 fc = part.function_call
                 code = fc.args.get("code", "")
                 print(f"[Tool call] execute_tools(code=...)")
-                print(f"  Code:\n{_indent(code)}")
+                print(f"  Code:\n{indent(code)}")
 
-                result = execute_fn(code)
-                print(f"  Result:\n{_indent(result)}\n")
+                result = await execute_fn(code)
+                print(f"  Result:\n{indent(result)}\n")
 
                 response_parts.append(
                     types.Part.from_function_response(
@@ -114,9 +103,5 @@ def main():
             break
 
 
-def _indent(text: str, prefix: str = "    ") -> str:
-    return "\n".join(f"{prefix}{line}" for line in text.strip().split("\n"))
-
-
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
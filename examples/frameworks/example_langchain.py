@@ -3,10 +3,11 @@
 Uses toolkit.as_tool() wrapped with LangChain's @tool decorator,
 then bound to a chat model via bind_tools().
 
-Also shows the difference between assist_tool_chaining=True and False.
+Pass --compare to also show the difference between assist_tool_chaining=True
+and False.
 
 Usage:
-    uv run python examples/frameworks/example_langchain.py
+    uv run python examples/frameworks/example_langchain.py [--compare]
 
 Requires:
     OPENAI_API_KEY in .env or environment
@@ -20,7 +21,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from dotenv import load_dotenv
 
-from shared_tools import USER_PROMPT, toolkit, toolkit_basic
+from shared_tools import USER_PROMPT, indent, print_comparison, toolkit
 
 load_dotenv()
 
@@ -30,26 +31,13 @@ def main():
     from langchain_core.tools import tool as langchain_tool
     from langchain_openai import ChatOpenAI
 
-    # ── Compare: with vs without tool chaining ──────────────────────
-    # LangChain reads the docstring from as_tool(), so the difference
-    # shows up in what the LLM sees as the tool description.
-    print("=" * 60)
-    print("COMPARISON: Meta-tool docstring sent to the LLM")
-    print("=" * 60)
+    # ── Compare: with vs without tool chaining (--compare) ──────────
+    if "--compare" in sys.argv:
+        from shared_tools import BASIC_DOC, CHAINED_DOC
 
-    basic_doc = toolkit_basic.as_tool().__doc__
-    chained_doc = toolkit.as_tool().__doc__
-
-    print("\n--- Without assist_tool_chaining ---")
-    print(basic_doc)
-
-    print("\n--- With assist_tool_chaining ---")
-    print(chained_doc)
-
-    print("\n" + "=" * 60)
-    print("The chaining-enabled version includes 'Returns: {...}' hints")
-    print("so the LLM knows the exact shape of each tool's output.")
-    print("=" * 60 + "\n")
+        # LangChain reads the docstring from as_tool(), so the difference
+        # shows up in what the LLM sees as the tool description.
+        print_comparison("Meta-tool docstring sent to the LLM", BASIC_DOC, CHAINED_DOC)
 
     # ── Main flow: uses the chaining-enabled toolkit ────────────────
     # LangChain requires its own @tool decorator for schema extraction,
@@ -82,11 +70,11 @@ def main():
         if ai_msg.tool_calls:
             for tc in ai_msg.tool_calls:
                 print(f"[Tool call] {tc['name']}(code=...)")
-                print(f"  Code:\n{_indent(tc['args'].get('code', ''))}")
+                print(f"  Code:\n{indent(tc['args'].get('code', ''))}")
 
                 tool_obj = tools_by_name[tc["name"]]
                 result = tool_obj.invoke(tc["args"])
-                print(f"  Result:\n{_indent(str(result))}\n")
+                print(f"  Result:\n{indent(str(result))}\n")
 
                 messages.append(ToolMessage(content=str(result), tool_call_id=tc["id"]))
         else:
@@ -94,9 +82,5 @@ def main():
             break
 
 
-def _indent(text: str, prefix: str = "    ") -> str:
-    return "\n".join(f"{prefix}{line}" for line in text.strip().split("\n"))
-
-
 if __name__ == "__main__":
     main()
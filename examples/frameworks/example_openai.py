@@ -2,99 +2,146 @@
 
 Uses toolkit.as_tool() to register a single meta-tool with OpenAI's
 chat completions API. The LLM calls the meta-tool with Python code,
-ez-ptc executes it and returns the result.
+ez-ptc executes it and returns the result. Responses are streamed so each
+tool call starts executing as soon as its arguments are complete.
 
-Also shows the difference between assist_tool_chaining=True and False.
+Pass --compare to also show the difference between assist_tool_chaining=True
+and False.
 
 Usage:
-    uv run python examples/frameworks/example_openai.py
+    uv run python examples/frameworks/example_openai.py [--compare]
 
 Requires:
     OPENAI_API_KEY in .env or environment
     pip install openai python-dotenv
+    pip install orjson  (optional, faster tool-call argument parsing)
 """
 
-import json
+import asyncio
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from dotenv import load_dotenv
-from openai import OpenAI
-
-from shared_tools import USER_PROMPT, toolkit, toolkit_basic
+from openai import AsyncOpenAI
+
+from shared_tools import (
+    USER_PROMPT,
+    console,
+    history_messages,
+    indent,
+    json_loads,
+    new_history,
+    print_comparison,
+    toolkit,
+)
 
 load_dotenv()
 
 
-def main():
-    client = OpenAI()
-
-    # ── Compare: with vs without tool chaining ──────────────────────
-    print("=" * 60)
-    print("COMPARISON: Tool schema description sent to the LLM")
-    print("=" * 60)
-
-    basic_desc = toolkit_basic.tool_schema()["function"]["description"]
-    chained_desc = toolkit.tool_schema()["function"]["description"]
+async def main():
+    client = AsyncOpenAI()
 
-    print("\n--- Without assist_tool_chaining ---")
-    print(basic_desc)
+    # ── Compare: with vs without tool chaining (--compare) ──────────
+    if "--compare" in sys.argv:
+        from shared_tools import BASIC_DESC, CHAINED_DESC
 
-    print("\n--- With assist_tool_chaining ---")
-    print(chained_desc)
-
-    print("\n" + "=" * 60)
-    print("The chaining-enabled version includes 'Returns: {...}' hints")
-    print("so the LLM knows the exact shape of each tool's output.")
-    print("=" * 60 + "\n")
+        print_comparison("Tool schema description sent to the LLM", BASIC_DESC, CHAINED_DESC)
 
     # ── Main flow: uses the chaining-enabled toolkit ────────────────
     tool_schema = toolkit.tool_schema(format="openai")
-    execute_fn = toolkit.as_tool_sync()
+    execute_fn = toolkit.as_tool()  # async callable
 
-    messages = [
+    pinned = [
         {"role": "system", "content": f"You are a helpful assistant.\n\n{toolkit.tool_prompt()}"},
         {"role": "user", "content": USER_PROMPT},
     ]
+    turns = new_history()
 
     print(f"User: {USER_PROMPT}\n")
 
-    # Agentic loop
+    # Tool calls run one after another: execute_code() captures output by
+    # redirecting the process-wide sys.stdout, so concurrent calls would
+    # mix their prints. Concurrency belongs inside a call, via parallel().
+    exec_lock = asyncio.Lock()
+
+    async def run_call(args: dict) -> str:
+        async with exec_lock:
+            return await execute_fn(**args)
+
+    # Agentic loop — stream each response and start executing a tool call
+    # as soon as its arguments are complete (i.e. the next call begins or
+    # the stream ends), while the rest is still being generated
     for turn in range(10):
-        response = client.chat.completions.create(
+        stream = await client.chat.completions.create(
             model="gpt-4.1-mini",
-            messages=messages,
+            messages=history_messages(pinned, turns),
             tools=[tool_schema],
+            stream=True,
         )
 
-        choice = response.choices[0]
-
-        if choice.finish_reason == "tool_calls" or choice.message.tool_calls:
-            messages.append(choice.message)
-
-            for tool_call in choice.message.tool_calls:
-                args = json.loads(tool_call.function.arguments)
-                print(f"[Tool call] execute_tools(code=...)")
-                print(f"  Code:\n{_indent(args['code'])}")
-
-                result = execute_fn(**args)
-                print(f"  Result:\n{_indent(result)}\n")
-
-                messages.append({
+        content: list[str] = []
+        calls: list[dict] = []  # {"id", "name", "arguments": [fragments]}
+        tasks: list[asyncio.Task] = []
+
+        def dispatch(call: dict) -> None:
+            call["arguments"] = "".join(call["arguments"])
+            args = json_loads(call["arguments"])
+            console(f"[Tool call] execute_tools(code=...)")
+            console(f"  Code:\n{indent(args['code'])}")
+            tasks.append(asyncio.create_task(run_call(args)))
+
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    content.append(delta.content)
+                for tc in delta.tool_calls or []:
+                    if tc.index == len(calls):
+                        if calls:
+                            dispatch(calls[-1])
+                        calls.append({"id": tc.id, "name": tc.function.name, "arguments": []})
+                    if tc.function and tc.function.arguments:
+                        calls[tc.index]["arguments"].append(tc.function.arguments)
+            if calls:
+                dispatch(calls[-1])
+        except BaseException:
+            # Let calls that already started finish before the error
+            # propagates, rather than abandoning them mid-execution
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        if calls:
+            exchange = [{
+                "role": "assistant",
+                "content": "".join(content) or None,
+                "tool_calls": [
+                    {
+                        "id": call["id"],
+                        "type": "function",
+                        "function": {"name": call["name"], "arguments": call["arguments"]},
+                    }
+                    for call in calls
+                ],
+            }]
+            turns.append(exchange)
+
+            for call, task in zip(calls, tasks):
+                result = await task
+                console(f"  Result:\n{indent(result)}\n")
+
+                exchange.append({
                     "role": "tool",
-                    "tool_call_id": tool_call.id,
+                    "tool_call_id": call["id"],
                     "content": result,
                 })
         else:
-            print(f"Assistant: {choice.message.content}")
+            print(f"Assistant: {''.join(content)}")
             break
 
 
-def _indent(text: str, prefix: str = "    ") -> str:
-    return "\n".join(f"{prefix}{line}" for line in text.strip().split("\n"))
-
-
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+"""ez-ptc + OpenAI — Batch tool mode example.
+
+Runs the same tool-mode agentic loop as example_openai.py over a list of
+prompts concurrently. All sessions share one Toolkit, so the rendered
+tool schema and prompt are built once, and tools marked ``cache=True``
+reuse results across sessions (every prompt below asks about the same
+cities).
+
+Usage:
+    uv run python examples/frameworks/example_openai_batch.py
+
+Requires:
+    OPENAI_API_KEY in .env or environment
+    pip install openai python-dotenv
+"""
+
+import asyncio
+import json
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+from ez_ptc import Toolkit
+from shared_tools import history_messages, new_history, toolkit
+
+load_dotenv()
+
+PROMPTS = [
+    "What's the weather in San Francisco, CA? Suggest one product for it.",
+    "What's the weather in New York, NY? Suggest one product for it.",
+    "Compare the weather in San Francisco, CA and New York, NY.",
+    "Is it warmer in London, UK or San Francisco, CA?",
+]
+
+# Same tools, with result caching enabled — the simulated lookups are pure
+batch_toolkit = Toolkit(
+    [replace(tool, cache=True) for tool in toolkit],
+    assist_tool_chaining=True,
+)
+
+
+async def run_agent(
+    client: AsyncOpenAI,
+    prompt: str,
+    exec_lock: asyncio.Lock,
+    max_turns: int = 10,
+) -> str:
+    """Run one agentic loop to completion and return the final answer."""
+    tool_schema = batch_toolkit.tool_schema(format="openai")
+    execute_fn = batch_toolkit.as_tool()  # async callable
+
+    pinned = [
+        {"role": "system", "content": f"You are a helpful assistant.\n\n{batch_toolkit.tool_prompt()}"},
+        {"role": "user", "content": prompt},
+    ]
+    turns = new_history()
+
+    for _ in range(max_turns):
+        response = await client.chat.completions.create(
+            model="gpt-4.1-mini",
+            messages=history_messages(pinned, turns),
+            tools=[tool_schema],
+        )
+        message = response.choices[0].message
+
+        if not message.tool_calls:
+            return message.content or ""
+
+        exchange = [message]
+        turns.append(exchange)
+        for tool_call in message.tool_calls:
+            args = json.loads(tool_call.function.arguments)
+            # Model requests overlap across sessions; code execution does not,
+            # because execute_code() redirects the process-wide sys.stdout.
+            async with exec_lock:
+                result = await execute_fn(**args)
+            exchange.append({
+                "role": "tool",
+                "tool_call_id": tool_call.id,
+                "content": result,
+            })
+
+    return "(no answer within turn limit)"
+
+
+async def run_batch(prompts: list[str], concurrency: int = 8) -> list[str]:
+    """Run run_agent() over prompts with at most ``concurrency`` in flight."""
+    client = AsyncOpenAI()
+    sem = asyncio.Semaphore(concurrency)
+    exec_lock = asyncio.Lock()
+
+    async def one(prompt: str) -> str:
+        async with sem:
+            return await run_agent(client, prompt, exec_lock)
+
+    return await asyncio.gather(*(one(p) for p in prompts))
+
+
+async def main():
+    answers = await run_batch(PROMPTS)
+    for prompt, answer in zip(PROMPTS, answers):
+        print(f"User: {prompt}")
+        print(f"Assistant: {answer}\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
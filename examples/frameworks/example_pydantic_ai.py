@@ -3,10 +3,11 @@
 Uses toolkit.as_tool() registered as a Pydantic AI Tool on an Agent.
 Pydantic AI handles the tool-calling loop automatically.
 
-Also shows the difference between assist_tool_chaining=True and False.
+Pass --compare to also show the difference between assist_tool_chaining=True
+and False.
 
 Usage:
-    uv run python examples/frameworks/example_pydantic_ai.py
+    uv run python examples/frameworks/example_pydantic_ai.py [--compare]
 
 Requires:
     OPENAI_API_KEY in .env or environment
@@ -20,7 +21,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from dotenv import load_dotenv
 
-from shared_tools import USER_PROMPT, toolkit, toolkit_basic
+from shared_tools import USER_PROMPT, print_comparison, toolkit
 
 load_dotenv()
 
@@ -28,24 +29,11 @@ load_dotenv()
 def main():
     from pydantic_ai import Agent, Tool
 
-    # ── Compare: with vs without tool chaining ──────────────────────
-    print("=" * 60)
-    print("COMPARISON: Meta-tool docstring sent to the LLM")
-    print("=" * 60)
+    # ── Compare: with vs without tool chaining (--compare) ──────────
+    if "--compare" in sys.argv:
+        from shared_tools import BASIC_DOC, CHAINED_DOC
 
-    basic_doc = toolkit_basic.as_tool().__doc__
-    chained_doc = toolkit.as_tool().__doc__
-
-    print("\n--- Without assist_tool_chaining ---")
-    print(basic_doc)
-
-    print("\n--- With assist_tool_chaining ---")
-    print(chained_doc)
-
-    print("\n" + "=" * 60)
-    print("The chaining-enabled version includes 'Returns: {...}' hints")
-    print("so the LLM knows the exact shape of each tool's output.")
-    print("=" * 60 + "\n")
+        print_comparison("Meta-tool docstring sent to the LLM", BASIC_DOC, CHAINED_DOC)
 
     # ── Main flow: uses the chaining-enabled toolkit ────────────────
     # Wrap ez-ptc's meta-tool as a Pydantic AI Tool
@@ -16,6 +16,7 @@ Requires:
 """
 
 import asyncio
+import textwrap
 
 from dotenv import load_dotenv
 from anthropic import AsyncAnthropic
@@ -117,7 +118,7 @@ async def main():
             else:
                 print("\n--- Final Response ---")
                 for block in response.content:
-                    if hasattr(block, "text"):
+                    if block.type == "text":
                         print(block.text)
                 break
         else:
@@ -125,7 +126,7 @@ async def main():
 
 
 def _indent(text: str, prefix: str = "    ") -> str:
-    return "\n".join(f"{prefix}{line}" for line in text.strip().split("\n"))
+    return textwrap.indent(text.strip(), prefix, lambda _line: True)
 
 
 if __name__ == "__main__":
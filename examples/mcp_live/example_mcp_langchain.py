@@ -16,6 +16,7 @@ Requires:
 """
 
 import asyncio
+import textwrap
 
 from dotenv import load_dotenv
 
@@ -120,7 +121,7 @@ async def main():
 
 
 def _indent(text: str, prefix: str = "    ") -> str:
-    return "\n".join(f"{prefix}{line}" for line in text.strip().split("\n"))
+    return textwrap.indent(text.strip(), prefix, lambda _line: True)
 
 
 if __name__ == "__main__":
@@ -17,6 +17,7 @@ Requires:
 
 import asyncio
 import json
+import textwrap
 
 from dotenv import load_dotenv
 
@@ -124,7 +125,7 @@ async def main():
 
 
 def _indent(text: str, prefix: str = "    ") -> str:
-    return "\n".join(f"{prefix}{line}" for line in text.strip().split("\n"))
+    return textwrap.indent(text.strip(), prefix, lambda _line: True)
 
 
 if __name__ == "__main__":
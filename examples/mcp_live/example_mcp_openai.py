@@ -20,6 +20,7 @@ Requires:
 
 import asyncio
 import json
+import textwrap
 
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
@@ -126,7 +127,7 @@ async def main():
 
 
 def _indent(text: str, prefix: str = "    ") -> str:
-    return "\n".join(f"{prefix}{line}" for line in text.strip().split("\n"))
+    return textwrap.indent(text.strip(), prefix, lambda _line: True)
 
 
 if __name__ == "__main__":
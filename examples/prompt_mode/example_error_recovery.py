@@ -18,7 +18,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from dotenv import load_dotenv
 from openai import OpenAI
 
-from shared_tools import toolkit
+from shared_tools import indent, toolkit
 
 load_dotenv()
 
@@ -61,13 +61,13 @@ def main():
             print("  No code block found — accepting text response.")
             break
 
-        print(f"  Code:\n{_indent(code)}")
+        print(f"  Code:\n{indent(code)}")
 
         # Execute with validation
         result = toolkit.execute_sync(code)
 
         if result.success:
-            print(f"  Output:\n{_indent(result.output)}")
+            print(f"  Output:\n{indent(result.output)}")
             print(f"  Tool calls: {[tc['name'] for tc in result.tool_calls]}")
             break
         else:
@@ -85,9 +85,5 @@ def main():
         print(f"\nFailed after {MAX_ATTEMPTS} attempts.")
 
 
-def _indent(text: str, prefix: str = "    ") -> str:
-    return "\n".join(f"{prefix}{line}" for line in text.strip().split("\n"))
-
-
 if __name__ == "__main__":
     main()
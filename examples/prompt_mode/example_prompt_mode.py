@@ -5,10 +5,11 @@ prompt instruction block, the LLM writes code in its text response,
 and ez-ptc extracts and executes it. No framework needed — just raw
 OpenAI API calls.
 
-Also shows the difference between assist_tool_chaining=True and False.
+Pass --compare to also show the difference between assist_tool_chaining=True
+and False.
 
 Usage:
-    uv run python examples/prompt_mode/example_prompt_mode.py
+    uv run python examples/prompt_mode/example_prompt_mode.py [--compare]
 
 Requires:
     OPENAI_API_KEY in .env or environment
@@ -22,7 +23,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from dotenv import load_dotenv
 from openai import OpenAI
 
-from shared_tools import USER_PROMPT, toolkit, toolkit_basic
+from shared_tools import USER_PROMPT, print_comparison, toolkit
 
 load_dotenv()
 
@@ -30,25 +31,22 @@ load_dotenv()
 def main():
     client = OpenAI()
 
-    # ── Compare: with vs without tool chaining ──────────────────────
-    print("=" * 60)
-    print("COMPARISON: What the LLM sees in the system prompt")
-    print("=" * 60)
+    # ── Compare: with vs without tool chaining (--compare) ──────────
+    if "--compare" in sys.argv:
+        from shared_tools import BASIC_PROMPT, CHAINED_PROMPT
 
-    print("\n--- Without assist_tool_chaining (basic) ---")
-    print(toolkit_basic.prompt())
-
-    print("\n--- With assist_tool_chaining (recommended) ---")
-    print(toolkit.prompt())
-
-    print("\n" + "=" * 60)
-    print("Notice the '# Returns: ...' comments above. The LLM now knows")
-    print("the exact keys (temp, condition, etc.) to use when chaining.")
-    print("=" * 60)
+        print_comparison(
+            "What the LLM sees in the system prompt",
+            BASIC_PROMPT,
+            CHAINED_PROMPT,
+            footer=(
+                "Notice the '# Returns: ...' comments above. The LLM now knows",
+                "the exact keys (temp, condition, etc.) to use when chaining.",
+            ),
+        )
 
     # ── Main flow: uses the chaining-enabled toolkit ────────────────
     tool_instructions = toolkit.prompt()
-    print()
 
     # Send to LLM without any tool calling — just system prompt + user message
     response = client.chat.completions.create(
@@ -1,9 +1,20 @@
-"""Shared tool definitions used by all examples."""
+"""Shared tool definitions and helpers used by all examples."""
 
-from typing import TypedDict
+import bisect
+import functools
+import itertools
+import sys
+import textwrap
+from collections import defaultdict, deque
+from typing import Any, Callable, TypedDict
 
 from ez_ptc import Toolkit, ez_tool
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 
 class WeatherResult(TypedDict):
     location: str
@@ -38,6 +49,46 @@ def get_weather(location: str, unit: str = "celsius") -> WeatherResult:
     return {"location": location, "temp": temp, "unit": unit, "condition": city_data["condition"]}
 
 
+# Simulated product catalog, indexed once at import
+_CATALOG: list[ProductResult] = [
+    {"id": 1, "name": "Umbrella", "price": 24.99, "tags": ["rain", "weather"]},
+    {"id": 2, "name": "Sunglasses", "price": 49.99, "tags": ["sun", "weather"]},
+    {"id": 3, "name": "Rain Jacket", "price": 89.99, "tags": ["rain", "weather"]},
+    {"id": 4, "name": "Sun Hat", "price": 29.99, "tags": ["sun", "weather"]},
+    {"id": 5, "name": "Snow Boots", "price": 119.99, "tags": ["snow", "weather"]},
+    {"id": 6, "name": "Thermal Gloves", "price": 34.99, "tags": ["cold", "weather"]},
+]
+_PRODUCTS_BY_ID = {p["id"]: p for p in _CATALOG}
+_NAME_INDEX = {p["id"]: p["name"].lower() for p in _CATALOG}
+# All lowercased names joined into one string so substring search runs as
+# C-level str.find() calls; _NAME_STARTS maps a hit offset back to its id.
+_NAME_HAYSTACK = "\n".join(_NAME_INDEX.values())
+_NAME_STARTS: list[int] = list(
+    itertools.accumulate((len(n) + 1 for n in _NAME_INDEX.values()), initial=0)
+)[:-1]
+_NAME_IDS = list(_NAME_INDEX)
+_TAG_INDEX: dict[str, set[int]] = defaultdict(set)
+for _p in _CATALOG:
+    for _t in _p["tags"]:
+        _TAG_INDEX[_t].add(_p["id"])
+del _p, _t
+
+
+def _name_matches(q: str) -> set[int]:
+    """Ids of products whose lowercased name contains q."""
+    if not q or "\n" in q:
+        return {pid for pid, name in _NAME_INDEX.items() if q in name}
+    ids = set()
+    pos = _NAME_HAYSTACK.find(q)
+    while pos != -1:
+        i = bisect.bisect_right(_NAME_STARTS, pos) - 1
+        ids.add(_NAME_IDS[i])
+        # Resume at the next name — one hit per product is enough
+        nxt = _NAME_STARTS[i + 1] if i + 1 < len(_NAME_STARTS) else len(_NAME_HAYSTACK)
+        pos = _NAME_HAYSTACK.find(q, nxt)
+    return ids
+
+
 @ez_tool
 def search_products(query: str, limit: int = 5) -> list[ProductResult]:
     """Search the product catalog.
@@ -46,20 +97,18 @@ def search_products(query: str, limit: int = 5) -> list[ProductResult]:
         query: Search query string
         limit: Maximum number of results to return
     """
-    # Simulated product catalog
-    catalog = [
-        {"id": 1, "name": "Umbrella", "price": 24.99, "tags": ["rain", "weather"]},
-        {"id": 2, "name": "Sunglasses", "price": 49.99, "tags": ["sun", "weather"]},
-        {"id": 3, "name": "Rain Jacket", "price": 89.99, "tags": ["rain", "weather"]},
-        {"id": 4, "name": "Sun Hat", "price": 29.99, "tags": ["sun", "weather"]},
-        {"id": 5, "name": "Snow Boots", "price": 119.99, "tags": ["snow", "weather"]},
-        {"id": 6, "name": "Thermal Gloves", "price": 34.99, "tags": ["cold", "weather"]},
-    ]
     q = query.lower()
-    results = [p for p in catalog if q in p["name"].lower() or any(q in t for t in p["tags"])]
-    if not results:
-        results = catalog  # fallback: return everything
-    return results[:limit]
+    ids = _name_matches(q)
+    for tag, tag_ids in _TAG_INDEX.items():
+        if q in tag:
+            ids |= tag_ids
+    if not ids:
+        matches = _CATALOG[:limit]  # fallback: return everything
+    else:
+        matches = [_PRODUCTS_BY_ID[pid] for pid in sorted(ids)[:limit]]
+    # Fresh copies: executed code may mutate results (p["price"] *= 0.9),
+    # which must not leak into the catalog for later calls and sessions
+    return [{**p, "tags": list(p["tags"])} for p in matches]
 
 
 USER_PROMPT = (
@@ -68,6 +117,160 @@ USER_PROMPT = (
     "Print a summary of your findings."
 )
 
-# Two toolkits for comparison — with and without tool chaining
+# Chaining-enabled toolkit used by every example's main flow
 toolkit = Toolkit([get_weather, search_products], assist_tool_chaining=True)
-toolkit_basic = Toolkit([get_weather, search_products], assist_tool_chaining=False)
+
+
+# Comparison-only attributes, built on first access (PEP 562) so examples run
+# without --compare never construct the second toolkit. The schema
+# description is the same across formats, so one pair covers
+# tool_schema(format="openai"|"anthropic"|...).
+@functools.cache
+def _toolkit_basic() -> Toolkit:
+    return Toolkit([get_weather, search_products], assist_tool_chaining=False)
+
+
+_LAZY_ATTRS: dict[str, Callable[[], Any]] = {
+    "toolkit_basic": _toolkit_basic,
+    "BASIC_DESC": lambda: _toolkit_basic().tool_schema()["function"]["description"],
+    "CHAINED_DESC": lambda: toolkit.tool_schema()["function"]["description"],
+    "BASIC_DOC": lambda: _toolkit_basic().as_tool().__doc__,
+    "CHAINED_DOC": lambda: toolkit.as_tool().__doc__,
+    "BASIC_PROMPT": lambda: _toolkit_basic().prompt(),
+    "CHAINED_PROMPT": lambda: toolkit.prompt(),
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        factory = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = globals()[name] = factory()
+    return value
+
+
+# Tool-calling turns kept in the agentic loops' request history. Older turns
+# are dropped whole so a tool result never outlives the call that produced it.
+MAX_HISTORY_TURNS = 4
+
+
+def new_history() -> deque[list]:
+    """Return an empty bounded store of turns (assistant message + tool results)."""
+    return deque(maxlen=MAX_HISTORY_TURNS)
+
+
+def history_messages(pinned: list, turns: deque[list]) -> list:
+    """Build the request message list: pinned prompt messages, then recent turns."""
+    return [*pinned, *itertools.chain.from_iterable(turns)]
+
+
+class AgentSession:
+    """One OpenAI-format chat-completions conversation driven by a Toolkit.
+
+    Owns the pinned system/user messages, the bounded turn history, and the
+    toolkit's execute function; ``complete(messages, tools)`` is the provider
+    call (OpenAI, LiteLLM, ...). Each ``step()`` runs one model turn.
+
+    Example::
+
+        session = AgentSession(toolkit, complete, USER_PROMPT)
+        while not session.done:
+            session.step()
+    """
+
+    def __init__(
+        self,
+        toolkit: Toolkit,
+        complete: Callable[[list, list], Any],
+        prompt: str,
+        system: str = "You are a helpful assistant.",
+        max_turns: int = 10,
+    ) -> None:
+        self.pinned = [
+            {"role": "system", "content": f"{system}\n\n{toolkit.tool_prompt()}"},
+            {"role": "user", "content": prompt},
+        ]
+        self.turns = new_history()
+        self.tools = [toolkit.tool_schema(format="openai")]
+        self.max_turns = max_turns
+        self.turn_count = 0
+        self.answer: str | None = None
+        self._complete = complete
+        self._execute = toolkit.as_tool_sync()
+
+    @property
+    def done(self) -> bool:
+        return self.answer is not None or self.turn_count >= self.max_turns
+
+    def step(self) -> None:
+        """Send the current history, then run any tool calls in the reply."""
+        self.turn_count += 1
+        response = self._complete(history_messages(self.pinned, self.turns), self.tools)
+        message = response.choices[0].message
+
+        if not message.tool_calls:
+            self.answer = message.content or ""
+            print(f"Assistant: {self.answer}")
+            return
+
+        exchange = [message]
+        self.turns.append(exchange)
+        for tool_call in message.tool_calls:
+            args = json_loads(tool_call.function.arguments)
+            print(f"[Tool call] execute_tools(code=...)")
+            print(f"  Code:\n{indent(args['code'])}")
+
+            result = self._execute(**args)
+            print(f"  Result:\n{indent(result)}\n")
+
+            exchange.append({
+                "tool_call_id": tool_call.id,
+                "role": "tool",
+                "name": tool_call.function.name,
+                "content": result,
+            })
+
+
+_CHAINING_FOOTER = (
+    "The chaining-enabled version includes 'Returns: {...}' hints",
+    "so the LLM knows the exact shape of each tool's output.",
+)
+
+
+def indent(text: str, prefix: str = "    ") -> str:
+    """Indent every line of text (including blank ones) with prefix."""
+    return textwrap.indent(text.strip(), prefix, lambda _line: True)
+
+
+def console(*args: Any) -> None:
+    """print() to the real terminal, even while an execution is running.
+
+    execute_code() captures output by swapping the process-wide sys.stdout,
+    so a plain print() from the event loop during an overlapping execution
+    would land in that execution's tool result instead of on the console.
+    """
+    print(*args, file=sys.__stdout__)
+
+
+def print_comparison(
+    title: str,
+    basic: str,
+    chained: str,
+    footer: tuple[str, ...] = _CHAINING_FOOTER,
+) -> None:
+    """Print the with/without assist_tool_chaining comparison banner."""
+    print("=" * 60)
+    print(f"COMPARISON: {title}")
+    print("=" * 60)
+
+    print("\n--- Without assist_tool_chaining ---")
+    print(basic)
+
+    print("\n--- With assist_tool_chaining ---")
+    print(chained)
+
+    print("\n" + "=" * 60)
+    for line in footer:
+        print(line)
+    print("=" * 60 + "\n")
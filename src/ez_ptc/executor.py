@@ -5,23 +5,28 @@ from __future__ import annotations
 import ast
 import asyncio
 import builtins
+import concurrent.futures
+import functools
 import inspect
 import io
 import json
+import math
 import queue
+import re
 import signal
+import sys
 import threading
 import time
 import traceback
-from contextlib import redirect_stderr, redirect_stdout
 from dataclasses import dataclass, field
+from types import CodeType
 from typing import TYPE_CHECKING, Any, Callable, Literal
 
 if TYPE_CHECKING:
     from .tool import Tool
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCallRecord:
     """Structured record of a single tool invocation."""
 
@@ -32,7 +37,7 @@ class ToolCallRecord:
     duration_ms: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionEvent:
     """Event emitted during streaming execution.
 
@@ -45,14 +50,14 @@ class ExecutionEvent:
     data: Any
 
 
-@dataclass
+@dataclass(slots=True)
 class PendingToolCall:
     """A tool call that requires human approval before execution."""
 
     tool_name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionResult:
     """Result of executing LLM-generated code.
 
@@ -120,63 +125,160 @@ class _TimeoutError(Exception):
     """Raised when code execution exceeds the timeout."""
 
 
-def _make_tool_wrapper(
-    tool: Tool,
+# Sentinel for tool-result cache misses (None is a valid cached result)
+_MISSING = object()
+
+
+class _DaemonWorkerPool:
+    """Reusable daemon threads for the thread-based timeout path.
+
+    Not a ThreadPoolExecutor: its workers are joined at interpreter exit, so
+    one runaway snippet would hang shutdown. Here workers are daemonic, and a
+    new one is started whenever none is idle — a timed-out job keeps its
+    thread without starving later executions.
+    """
+
+    def __init__(self, max_idle: int = 4) -> None:
+        self._jobs: queue.SimpleQueue[tuple[Callable[[], None], threading.Event]] = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._idle = 0
+        self._max_idle = max_idle
+
+    def submit(self, fn: Callable[[], None]) -> threading.Event:
+        """Run fn on a worker; the returned event is set when it finishes."""
+        done = threading.Event()
+        with self._lock:
+            spawn = self._idle == 0
+            if not spawn:
+                self._idle -= 1
+        self._jobs.put((fn, done))
+        if spawn:
+            threading.Thread(target=self._work, daemon=True).start()
+        return done
+
+    def _work(self) -> None:
+        while True:
+            fn, done = self._jobs.get()
+            try:
+                fn()
+            finally:
+                done.set()
+            with self._lock:
+                if self._idle >= self._max_idle:
+                    return
+                self._idle += 1
+
+
+_WORKER_POOL = _DaemonWorkerPool()
+
+
+def _resolve_awaitable(awaitable: Any, loop: asyncio.AbstractEventLoop | None) -> Any:
+    """Run an awaitable returned by a tool to completion from sync sandbox code."""
+    if loop is not None and loop.is_running():
+        # Efficient path: dispatch to the main event loop
+        future = asyncio.run_coroutine_threadsafe(awaitable, loop)
+        return future.result()
+
+    # _get_running_loop() returns None instead of raising — no
+    # exception on the common no-loop path
+    current_loop = asyncio._get_running_loop()
+    if current_loop is not None and current_loop.is_running():
+        # We're already in an async context — run in a new thread
+        with concurrent.futures.ThreadPoolExecutor() as pool:
+            return pool.submit(asyncio.run, awaitable).result()
+    return asyncio.run(awaitable)
+
+
+def _make_call_recorder(
     call_log: list[ToolCallRecord],
-    loop: asyncio.AbstractEventLoop | None = None,
     on_tool_call: Callable[[ToolCallRecord], None] | None = None,
     event_queue: queue.Queue | None = None,
-) -> Callable[..., Any]:
-    """Create a wrapper around a tool function that logs calls."""
-
-    def wrapper(*args: Any, **kwargs: Any) -> Any:
-        start = time.perf_counter()
+) -> Callable[[str, tuple, dict[str, Any], Any, float], None]:
+    """Create the per-execution function that logs a finished tool call.
 
-        result = tool.fn(*args, **kwargs)
-
-        # Handle async tools
-        if inspect.isawaitable(result):
-            if loop is not None and loop.is_running():
-                # Efficient path: dispatch to the main event loop
-                future = asyncio.run_coroutine_threadsafe(result, loop)
-                result = future.result()
-            else:
-                try:
-                    current_loop = asyncio.get_running_loop()
-                except RuntimeError:
-                    current_loop = None
-
-                if current_loop and current_loop.is_running():
-                    # We're already in an async context — run in a new thread
-                    import concurrent.futures
-                    with concurrent.futures.ThreadPoolExecutor() as pool:
-                        result = pool.submit(asyncio.run, result).result()
-                else:
-                    result = asyncio.run(result)
+    Built once per execute_code() and shared by every tool wrapper.
+    """
+    log_append = call_log.append
 
+    def record_call(name: str, args: tuple, kwargs: dict[str, Any], result: Any, start: float) -> None:
         duration_ms = (time.perf_counter() - start) * 1000
         record = ToolCallRecord(
-            name=tool.name,
+            name=name,
             args=args,
             kwargs=kwargs,
             result=result,
             duration_ms=duration_ms,
         )
-        call_log.append(record)
+        log_append(record)
         if on_tool_call is not None:
             on_tool_call(record)
         if event_queue is not None:
             event_queue.put(ExecutionEvent(type="tool_call", data=record))
+
+    return record_call
+
+
+def _cache_key(args: tuple, kwargs: dict[str, Any]) -> tuple:
+    """Result-cache key for a tool call, typed like ``lru_cache(typed=True)``.
+
+    1, 1.0 and True hash and compare equal, but a tool may treat them
+    differently, so each top-level argument is keyed with its type.
+    """
+    return (
+        tuple((type(a), a) for a in args),
+        tuple(sorted((k, type(v), v) for k, v in kwargs.items())),
+    )
+
+
+def _make_tool_wrapper(
+    tool: Tool,
+    record_call: Callable[[str, tuple, dict[str, Any], Any, float], None],
+    loop: asyncio.AbstractEventLoop | None = None,
+) -> Callable[..., Any]:
+    """Create a wrapper around a tool function that logs calls via record_call."""
+    fn = tool.fn
+    tool_name = tool.name
+    # Known coroutine functions skip the per-call awaitable probe. Sync tools
+    # keep it: a plain function may still return an awaitable (e.g. a
+    # hand-written wrapper around an async function).
+    is_async = inspect.iscoroutinefunction(fn)
+
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+
+        cache_key = None
+        if tool.cache:
+            cache_key = _cache_key(args, kwargs)
+            try:
+                result = tool._call_cache.get(cache_key, _MISSING)
+            except TypeError:  # unhashable arguments — call through
+                cache_key = None
+                result = _MISSING
+            if result is not _MISSING:
+                record_call(tool_name, args, kwargs, result, start)
+                return result
+
+        result = fn(*args, **kwargs)
+
+        # Handle async tools
+        if is_async or inspect.isawaitable(result):
+            result = _resolve_awaitable(result, loop)
+
+        if cache_key is not None:
+            tool._call_cache[cache_key] = result
+        record_call(tool_name, args, kwargs, result, start)
         return result
 
-    wrapper.__name__ = tool.name
+    wrapper.__name__ = tool_name
     wrapper.__doc__ = tool.description
     return wrapper
 
 
+_PARALLEL_MAX_WORKERS = 32
+
+
 def _make_parallel_helper() -> Callable[..., list[Any]]:
     """Create a parallel() helper that runs (callable, *args) tuples concurrently."""
-    import concurrent.futures
 
     def parallel(*specs: Any) -> list[Any]:
         """Run multiple tool calls in parallel.
@@ -203,7 +305,14 @@ def _make_parallel_helper() -> Callable[..., list[Any]]:
                     f"Argument {i}: first element of each tuple must be a callable"
                 )
 
-        with concurrent.futures.ThreadPoolExecutor() as pool:
+        if len(specs) == 1:
+            fn, *args = specs[0]
+            return [fn(*args)]
+
+        # One thread per call (up to a cap) so an I/O-bound batch finishes in
+        # about the time of its slowest call, not in waves of the default
+        # pool size (min(32, cpu_count + 4)).
+        with concurrent.futures.ThreadPoolExecutor(min(len(specs), _PARALLEL_MAX_WORKERS)) as pool:
             futures = []
             for spec in specs:
                 fn, *args = spec
@@ -213,6 +322,31 @@ def _make_parallel_helper() -> Callable[..., list[Any]]:
     return parallel
 
 
+_LLM_CODE_FILENAMES = ("<string>", "<llm_code>")
+
+
+def _format_traceback(e: BaseException, full: bool = False) -> str:
+    """Format the traceback written to stderr after a failed execution.
+
+    The compact form keeps only frames from the executed code plus the
+    innermost frame, so deep tool internals are neither walked for source
+    lines nor shown to the model. ``full=True`` gives ``traceback.format_exc()``
+    output, including chained exceptions.
+    """
+    if full:
+        return "".join(traceback.format_exception(e))
+
+    frames = traceback.StackSummary.extract(traceback.walk_tb(e.__traceback__), lookup_lines=False)
+    kept = [
+        f for i, f in enumerate(frames)
+        if f.filename in _LLM_CODE_FILENAMES or i == len(frames) - 1
+    ]
+    lines = ["Traceback (most recent call last):\n"]
+    lines.extend(traceback.StackSummary.from_list(kept).format())
+    lines.extend(traceback.format_exception_only(e))
+    return "".join(lines)
+
+
 def _enrich_error(e: Exception, stderr_capture: io.StringIO | _QueueWriter) -> None:
     """Append available keys/attributes to error output for LLM self-correction."""
     tb = e.__traceback__
@@ -411,6 +545,76 @@ def _safe_import(
     )
 
 
+# Sandbox builtins with the restricted importer baked in. Each execution gets
+# its own .copy() so code that mutates __builtins__ cannot leak into the next.
+_SANDBOX_BUILTINS: dict[str, Any] = {**_SAFE_BUILTINS, "__import__": _safe_import}
+
+
+# Snippets longer than this are compiled on every call rather than cached
+_CODE_CACHE_MAX_LEN = 16_384
+
+
+def _split_and_compile(code: str) -> tuple[CodeType | None, CodeType | None]:
+    """Compile code into (body, last_expr) code objects.
+
+    The code is split into body + last expression so we can capture its
+    value (like a Python REPL / Jupyter cell). Either part may be None.
+    Raises SyntaxError for invalid code.
+    """
+    tree = ast.parse(code)
+
+    if not (tree.body and isinstance(tree.body[-1], ast.Expr)):
+        return compile(code, "<string>", "exec"), None
+
+    # Last statement is a bare expression — compile it separately
+    # so we can capture its value with eval().
+    # The nodes keep their original positions, so tracebacks point at the
+    # line the LLM actually wrote.
+    last_node = tree.body.pop()
+    body_code = None
+    if tree.body:
+        body_code = compile(tree, "<string>", "exec")  # remaining statements
+    last_expr_code = compile(ast.Expression(body=last_node.value), "<string>", "eval")
+    return body_code, last_expr_code
+
+
+@dataclass(frozen=True, slots=True)
+class _CachedSyntaxError:
+    """Class and args of a SyntaxError, enough to raise an equivalent one.
+
+    The exception instance itself is never cached: every raise attaches a
+    traceback that would keep the raising frame (namespace, tools, capture
+    buffers) alive, and concurrent callers would share one mutable object.
+    """
+
+    cls: type[SyntaxError]
+    args: tuple
+
+
+def _split_and_compile_or_error(code: str) -> tuple[CodeType | None, CodeType | None] | _CachedSyntaxError:
+    """Like _split_and_compile(), but return the SyntaxError's details instead of raising."""
+    try:
+        return _split_and_compile(code)
+    except SyntaxError as e:
+        return _CachedSyntaxError(type(e), e.args)
+
+
+# LLMs often resubmit identical snippets (retries, repeated turns); compiling
+# is pure, so the code objects — or the syntax error — can be shared across
+# executions.
+_split_and_compile_cached = functools.lru_cache(maxsize=512)(_split_and_compile_or_error)
+
+
+def _compile_code(code: str) -> tuple[CodeType | None, CodeType | None]:
+    """Return (body, last_expr) code objects for code, cached for repeat snippets."""
+    if len(code) > _CODE_CACHE_MAX_LEN:
+        return _split_and_compile(code)
+    compiled = _split_and_compile_cached(code)
+    if isinstance(compiled, _CachedSyntaxError):
+        raise compiled.cls(*compiled.args)
+    return compiled
+
+
 def execute_code(
     code: str,
     tools: dict[str, Tool],
@@ -419,6 +623,7 @@ def execute_code(
     has_async_tools: bool = False,
     on_tool_call: Callable[[ToolCallRecord], None] | None = None,
     event_queue: queue.Queue | None = None,
+    full_traceback: bool = False,
 ) -> ExecutionResult:
     """Execute LLM-generated Python code with tools injected as globals.
 
@@ -430,6 +635,9 @@ def execute_code(
         has_async_tools: Deprecated — ignored. Kept for backward compatibility.
         on_tool_call: Optional callback invoked after each tool call with a ToolCallRecord.
         event_queue: Optional queue for streaming events.
+        full_traceback: Write the complete traceback (every frame, chained
+            exceptions) to error_output instead of the compact form that keeps
+            only frames from the executed code plus the innermost frame.
 
     Returns:
         ExecutionResult with captured output, tool calls, and error info
@@ -445,61 +653,45 @@ def execute_code(
 
     # Build restricted namespace
     namespace: dict[str, Any] = {}
-    builtins_dict = dict(_SAFE_BUILTINS)
-    builtins_dict["__import__"] = _safe_import
-    namespace["__builtins__"] = builtins_dict
+    namespace["__builtins__"] = _SANDBOX_BUILTINS.copy()
 
     # Pre-inject commonly needed modules (available without import)
-    import math as _math
-    import re as _re
-
     namespace["json"] = json
     namespace["asyncio"] = asyncio
-    namespace["math"] = _math
-    namespace["re"] = _re
+    namespace["math"] = math
+    namespace["re"] = re
 
     # Add tool wrappers — always sync; _make_tool_wrapper handles async tools
     # transparently via run_coroutine_threadsafe.
+    record_call = _make_call_recorder(call_log, on_tool_call=on_tool_call, event_queue=event_queue)
     for name, tool in tools.items():
-        namespace[name] = _make_tool_wrapper(tool, call_log, loop=loop, on_tool_call=on_tool_call, event_queue=event_queue)
+        namespace[name] = _make_tool_wrapper(tool, record_call, loop=loop)
 
     # Inject parallel() helper for concurrent tool calls
     namespace["parallel"] = _make_parallel_helper()
 
     result = ExecutionResult()
 
-    # Split code into body + last expression so we can capture its value
-    # (like a Python REPL / Jupyter cell).
     try:
-        tree = ast.parse(code)
+        body_code, last_expr_code = _compile_code(code)
     except SyntaxError as e:
         result.success = False
         result.error = f"SyntaxError: {e}"
         result.error_output = f"SyntaxError: {e}"
         return result
 
-    last_expr_code = None
-    body_code = code  # default: run everything with exec
-
-    if tree.body and isinstance(tree.body[-1], ast.Expr):
-        # Last statement is a bare expression — compile it separately
-        # so we can capture its value with eval().
-        last_node = tree.body.pop()
-        if tree.body:
-            body_code = ast.unparse(tree)  # remaining statements
-        else:
-            body_code = None
-        last_expr_code = ast.unparse(ast.Expression(body=last_node.value))
-
     def _run() -> None:
         nonlocal result
+        # Swap the streams directly — same effect as redirect_stdout/stderr
+        # without two context-manager round-trips per execution.
+        saved_stdout, saved_stderr = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = stdout_capture, stderr_capture
         try:
-            with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-                if body_code:
-                    exec(body_code, namespace)
-                if last_expr_code:
-                    val = eval(last_expr_code, namespace)
-                    result.return_value = val
+            if body_code:
+                exec(body_code, namespace)
+            if last_expr_code:
+                val = eval(last_expr_code, namespace)
+                result.return_value = val
         except _TimeoutError:
             result.success = False
             result.error = f"Execution timed out after {timeout} seconds"
@@ -507,25 +699,19 @@ def execute_code(
             result.success = False
             result.error = f"{type(e).__name__}: {e}"
             # Capture traceback to stderr for LLM self-correction
-            tb = traceback.format_exc()
-            stderr_capture.write(tb)
+            stderr_capture.write(_format_traceback(e, full=full_traceback))
             _enrich_error(e, stderr_capture)
+        finally:
+            sys.stdout, sys.stderr = saved_stdout, saved_stderr
 
-    # Detect if there's already a running event loop (e.g., inside an async framework
-    # like Pydantic AI). If so, we must use thread-based execution so LLM code that
+    # Use signal-based timeout on Unix when safe, threading otherwise.
+    # If there's already a running event loop (e.g., inside an async framework
+    # like Pydantic AI), we must use thread-based execution so LLM code that
     # calls asyncio.run() gets a clean thread with no existing loop.
-    def _has_running_loop() -> bool:
-        try:
-            asyncio.get_running_loop()
-            return True
-        except RuntimeError:
-            return False
-
-    # Use signal-based timeout on Unix when safe, threading otherwise
     _use_signal = (
         hasattr(signal, "SIGALRM")
         and threading.current_thread() is threading.main_thread()
-        and not _has_running_loop()
+        and asyncio._get_running_loop() is None
     )
 
     if _use_signal:
@@ -536,20 +722,18 @@ def execute_code(
 
         try:
             signal.signal(signal.SIGALRM, _timeout_handler)
-            import math as _math_
-            signal.alarm(max(1, _math_.ceil(timeout)))
+            signal.alarm(max(1, math.ceil(timeout)))
             _run()
         finally:
             signal.alarm(0)
             signal.signal(signal.SIGALRM, original_handler)
     else:
-        # Fallback: run in a thread with a timeout.
-        # Note: if the thread times out, the daemon thread continues running in the
-        # background until the process exits. Python threads cannot be forcibly killed.
-        thread = threading.Thread(target=_run, daemon=True)
-        thread.start()
-        thread.join(timeout=timeout)
-        if thread.is_alive():
+        # Fallback: run on a pooled daemon thread with a timeout.
+        # Note: if the code times out, its thread continues running in the
+        # background until the code finishes or the process exits. Python threads
+        # cannot be forcibly killed.
+        done = _WORKER_POOL.submit(_run)
+        if not done.wait(timeout=timeout):
             result.success = False
             result.error = f"Execution timed out after {timeout} seconds"
 
@@ -1,11 +1,38 @@
 """Type hint to JSON schema conversion for tool functions."""
 
+import functools
 import inspect
 import re
 import types
 import typing
+import weakref
 from typing import Any, Callable, get_args, get_origin
 
+# Google-style docstring section headers (without the trailing colon)
+_ARGS_HEADERS = frozenset({"Args", "Arguments", "Parameters", "Params"})
+_SECTION_HEADERS = _ARGS_HEADERS | {
+    "Returns", "Return", "Raises", "Yields", "Note",
+    "Notes", "Example", "Examples", "References",
+    "Attributes", "Todo", "See Also", "Warnings",
+}
+
+# Python primitive → JSON schema "type"
+_PRIMITIVE_JSON_TYPES: dict[type, str] = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+}
+
+# Return annotations that carry no structure worth showing for chaining
+_TRIVIAL_RETURN_ANNOTATIONS: frozenset[Any] = frozenset({
+    None, inspect.Signature.empty, Any, type(None),
+    dict, list, str, int, float, bool,
+})
+
+# "param_name: description" or "param_name (type): description"
+_PARAM_RE = re.compile(r"^\s{0,8}(\w+)(?:\s*\([^)]*\))?\s*:\s*(.*)")
+
 
 def _parse_docstring(fn: Callable) -> tuple[str, dict[str, str]]:
     """Parse a function's docstring to extract description and parameter docs.
@@ -20,7 +47,14 @@ def _parse_docstring(fn: Callable) -> tuple[str, dict[str, str]]:
     doc = inspect.getdoc(fn)
     if not doc:
         return "", {}
+    return _parse_docstring_text(doc)
 
+
+# Tools built by a factory or redefined per call share one docstring text.
+# The cached result is shared, so callers must not mutate it.
+@functools.lru_cache(maxsize=1024)
+def _parse_docstring_text(doc: str) -> tuple[str, dict[str, str]]:
+    """Parse a cleaned docstring (memoized per text) — see _parse_docstring()."""
     lines = doc.strip().split("\n")
     description_lines: list[str] = []
     param_docs: dict[str, str] = {}
@@ -29,21 +63,14 @@ def _parse_docstring(fn: Callable) -> tuple[str, dict[str, str]]:
     current_param: str | None = None
     current_desc_lines: list[str] = []
 
-    _SECTION_HEADERS = {
-        "Args", "Arguments", "Parameters", "Params",
-        "Returns", "Return", "Raises", "Yields", "Note",
-        "Notes", "Example", "Examples", "References",
-        "Attributes", "Todo", "See Also", "Warnings",
-    }
-
     in_section = False  # True once we've entered any section (Args or other)
 
     for line in lines:
         stripped = line.strip()
 
         # Detect any section header like "Args:", "Returns:", etc.
-        if stripped.endswith(":") and stripped.rstrip(":") in _SECTION_HEADERS:
-            section_name = stripped.rstrip(":")
+        if stripped.endswith(":") and stripped[:-1] in _SECTION_HEADERS:
+            section_name = stripped[:-1]
 
             # Save last param if leaving Args
             if in_args and current_param:
@@ -51,7 +78,7 @@ def _parse_docstring(fn: Callable) -> tuple[str, dict[str, str]]:
                 current_param = None
                 current_desc_lines = []
 
-            if section_name in ("Args", "Arguments", "Parameters", "Params"):
+            if section_name in _ARGS_HEADERS:
                 in_args = True
             else:
                 in_args = False
@@ -60,8 +87,7 @@ def _parse_docstring(fn: Callable) -> tuple[str, dict[str, str]]:
             continue
 
         if in_args:
-            # Try to match "param_name: description" or "param_name (type): description"
-            param_match = re.match(r"^\s{0,8}(\w+)(?:\s*\([^)]*\))?\s*:\s*(.*)", line)
+            param_match = _PARAM_RE.match(line)
             if param_match:
                 # Save previous param
                 if current_param:
@@ -90,81 +116,123 @@ def _parse_docstring(fn: Callable) -> tuple[str, dict[str, str]]:
 
 
 def _type_to_schema(annotation: Any) -> dict[str, Any]:
-    """Convert a Python type annotation to a JSON schema dict."""
-    if annotation is inspect.Parameter.empty or annotation is Any:
-        return {}
+    """Convert a Python type annotation to a JSON schema dict.
 
-    origin = get_origin(annotation)
+    Results are memoized per annotation; callers get a fresh copy they may
+    mutate freely.
+    """
+    # Fast path: most parameters are plain primitives
+    if type(annotation) is type and annotation in _PRIMITIVE_JSON_TYPES:
+        return {"type": _PRIMITIVE_JSON_TYPES[annotation]}
+    try:
+        schema = _type_to_schema_cached(_annotation_key(annotation))
+    except TypeError:
+        # Unhashable annotation (e.g. Annotated[int, {...}]) — build uncached
+        return _build_type_schema(annotation)
+    return _clone_schema(schema)
+
+
+def _annotation_key(annotation: Any) -> tuple:
+    """Cache key for an annotation that is sensitive to argument order.
+
+    Union equality ignores order (``Union[int, str] == Union[str, int]``), but
+    both the schema (first member wins) and the formatted string depend on it.
+    Raises TypeError for unhashable annotations.
+    """
     args = get_args(annotation)
+    key = (annotation, *map(_annotation_key, args)) if args else (annotation,)
+    hash(key)
+    return key
+
+
+def _clone_schema(value: Any) -> Any:
+    """Copy the dict/list structure of a JSON schema, sharing scalar leaves."""
+    if isinstance(value, dict):
+        return {k: _clone_schema(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clone_schema(v) for v in value]
+    return value
+
+
+def _union_schema(annotation: Any) -> dict[str, Any]:
+    # Optional[X] or general Union — use the first non-None type. Both union
+    # forms carry their members in __args__, so skip get_args() here.
+    for arg in annotation.__args__:
+        if arg is not type(None):
+            return _type_to_schema(arg)
+    return {}
 
-    # Handle Optional[X] which is Union[X, None] or X | None
-    if origin is typing.Union or isinstance(annotation, types.UnionType):
-        non_none = [a for a in args if a is not type(None)]
-        if len(non_none) == 1:
-            # Optional[X]
-            return _type_to_schema(non_none[0])
-        # General Union — just use first non-None type
-        if non_none:
-            return _type_to_schema(non_none[0])
-        return {}
 
-    # Handle Literal
-    if origin is typing.Literal:
-        values = list(args)
-        if all(isinstance(v, str) for v in values):
-            return {"type": "string", "enum": values}
-        elif all(isinstance(v, int) for v in values):
-            return {"type": "integer", "enum": values}
-        return {"enum": values}
-
-    # Handle Annotated — just use the first arg (the actual type)
-    if origin is typing.Annotated:
-        return _type_to_schema(args[0])
+def _literal_schema(annotation: Any) -> dict[str, Any]:
+    values = list(get_args(annotation))
+    if all(isinstance(v, str) for v in values):
+        return {"type": "string", "enum": values}
+    elif all(isinstance(v, int) for v in values):
+        return {"type": "integer", "enum": values}
+    return {"enum": values}
 
-    # Handle list[X]
-    if origin is list:
-        schema: dict[str, Any] = {"type": "array"}
-        if args:
-            schema["items"] = _type_to_schema(args[0])
-        return schema
 
-    # Handle dict[K, V]
-    if origin is dict:
-        schema = {"type": "object"}
-        if len(args) >= 2:
-            schema["additionalProperties"] = _type_to_schema(args[1])
-        return schema
+def _annotated_schema(annotation: Any) -> dict[str, Any]:
+    # Just use the first arg (the actual type)
+    return _type_to_schema(get_args(annotation)[0])
 
-    # Handle tuple
-    if origin is tuple:
-        return {"type": "array"}
 
-    # Handle set/frozenset
-    if origin in (set, frozenset):
-        schema = {"type": "array"}
-        if args:
-            schema["items"] = _type_to_schema(args[0])
-        return schema
+def _items_schema(annotation: Any) -> dict[str, Any]:
+    # list[X], set[X], frozenset[X]
+    schema: dict[str, Any] = {"type": "array"}
+    args = get_args(annotation)
+    if args:
+        schema["items"] = _type_to_schema(args[0])
+    return schema
 
-    # Primitive types
-    type_map: dict[type, str] = {
-        str: "string",
-        int: "integer",
-        float: "number",
-        bool: "boolean",
-    }
-    if annotation in type_map:
-        return {"type": type_map[annotation]}
 
-    # Plain list/dict without parameters
-    if annotation is list:
-        return {"type": "array"}
-    if annotation is dict:
-        return {"type": "object"}
+def _dict_schema(annotation: Any) -> dict[str, Any]:
+    schema: dict[str, Any] = {"type": "object"}
+    args = get_args(annotation)
+    if len(args) >= 2:
+        schema["additionalProperties"] = _type_to_schema(args[1])
+    return schema
+
+
+def _tuple_schema(annotation: Any) -> dict[str, Any]:
+    return {"type": "array"}
+
+
+# get_origin() of a parameterized annotation → schema builder
+_ORIGIN_SCHEMA_BUILDERS: dict[Any, Callable[[Any], dict[str, Any]]] = {
+    typing.Union: _union_schema,
+    types.UnionType: _union_schema,
+    typing.Literal: _literal_schema,
+    typing.Annotated: _annotated_schema,
+    list: _items_schema,
+    set: _items_schema,
+    frozenset: _items_schema,
+    dict: _dict_schema,
+    tuple: _tuple_schema,
+}
+
+# Bare (unparameterized) containers
+_BARE_CONTAINER_JSON_TYPES: dict[type, str] = {list: "array", dict: "object"}
+
+
+def _build_type_schema(annotation: Any) -> dict[str, Any]:
+    """Uncached implementation of _type_to_schema()."""
+    if annotation is inspect.Parameter.empty or annotation is Any:
+        return {}
+
+    builder = _ORIGIN_SCHEMA_BUILDERS.get(get_origin(annotation))
+    if builder is not None:
+        return builder(annotation)
+
+    # Primitive types and plain list/dict without parameters
+    if annotation in _PRIMITIVE_JSON_TYPES:
+        return {"type": _PRIMITIVE_JSON_TYPES[annotation]}
+    if annotation in _BARE_CONTAINER_JSON_TYPES:
+        return {"type": _BARE_CONTAINER_JSON_TYPES[annotation]}
 
     # TypedDict
     if _is_typed_dict(annotation):
-        hints = typing.get_type_hints(annotation)
+        hints = _typed_dict_hints(annotation)
         properties = {k: _type_to_schema(v) for k, v in hints.items()}
         required = sorted(annotation.__required_keys__)
         schema = {"type": "object", "properties": properties}
@@ -179,6 +247,12 @@ def _type_to_schema(annotation: Any) -> dict[str, Any]:
     return {}
 
 
+# Annotations repeat across tools (str, list[str], a shared TypedDict, ...)
+@functools.lru_cache(maxsize=1024)
+def _type_to_schema_cached(key: tuple) -> dict[str, Any]:
+    return _build_type_schema(key[0])
+
+
 def _is_pydantic_model(cls: Any) -> bool:
     """Check if a class is a Pydantic BaseModel."""
     try:
@@ -194,7 +268,26 @@ def _is_typed_dict(cls: Any) -> bool:
 
 
 def _format_annotation(annotation: Any) -> str:
-    """Format a type annotation as a readable string."""
+    """Format a type annotation as a readable string (memoized per annotation)."""
+    try:
+        return _format_annotation_cached(_annotation_key(annotation))
+    except TypeError:
+        # Unhashable annotation — format uncached
+        return _build_annotation_str(annotation)
+
+
+# Generic containers rendered as name[arg, ...]
+_CONTAINER_NAMES: dict[type, str] = {
+    list: "list",
+    dict: "dict",
+    tuple: "tuple",
+    set: "set",
+    frozenset: "frozenset",
+}
+
+
+def _build_annotation_str(annotation: Any) -> str:
+    """Uncached implementation of _format_annotation()."""
     if annotation is inspect.Parameter.empty:
         return ""
 
@@ -215,62 +308,105 @@ def _format_annotation(annotation: Any) -> str:
     if origin is typing.Annotated:
         return _format_annotation(args[0])
 
-    if origin is list:
+    name = _CONTAINER_NAMES.get(origin)
+    if name is not None:
         if args:
-            return f"list[{_format_annotation(args[0])}]"
-        return "list"
+            return f"{name}[{', '.join(map(_format_annotation, args))}]"
+        return name
 
-    if origin is dict:
-        if args:
-            return f"dict[{_format_annotation(args[0])}, {_format_annotation(args[1])}]"
-        return "dict"
+    if hasattr(annotation, "__name__"):
+        return annotation.__name__
 
-    if origin is tuple:
-        if args:
-            return f"tuple[{', '.join(_format_annotation(a) for a in args)}]"
-        return "tuple"
+    return str(annotation)
 
-    if origin is set:
-        if args:
-            return f"set[{_format_annotation(args[0])}]"
-        return "set"
 
-    if origin is frozenset:
-        if args:
-            return f"frozenset[{_format_annotation(args[0])}]"
-        return "frozenset"
+@functools.lru_cache(maxsize=1024)
+def _format_annotation_cached(key: tuple) -> str:
+    return _build_annotation_str(key[0])
 
-    if hasattr(annotation, "__name__"):
-        return annotation.__name__
 
-    return str(annotation)
+# Wrappers typing.get_type_hints() strips: Annotated metadata and the
+# TypedDict key qualifiers
+_STRIPPED_ORIGINS = frozenset(
+    q for q in (typing.Annotated, typing.Required, typing.NotRequired, getattr(typing, "ReadOnly", None))
+    if q is not None
+)
+
+
+def _needs_resolution(annotation: Any) -> bool:
+    """True if ``typing.get_type_hints`` would rewrite annotation.
+
+    That is, it contains a string / ForwardRef to evaluate, or Annotated
+    metadata / a Required-style qualifier to strip.
+    """
+    if isinstance(annotation, (str, typing.ForwardRef)):
+        return True
+    origin = get_origin(annotation)
+    if origin is typing.Literal:
+        return False  # Literal["a"] args are values, not forward references
+    if origin in _STRIPPED_ORIGINS:
+        return True
+    return any(_needs_resolution(a) for a in get_args(annotation))
+
+
+def _get_type_hints(fn: Callable, sig: inspect.Signature | None = None) -> dict[str, Any]:
+    """Resolved annotations of fn, keyed by parameter name (plus "return").
+
+    Concrete annotations are used as-is; ``typing.get_type_hints`` (which
+    evaluates every string annotation against the module globals) only runs
+    when something needs resolving, e.g. under ``from __future__ import annotations``.
+    """
+    raw = getattr(fn, "__annotations__", None)
+    if isinstance(raw, dict) and not any(_needs_resolution(v) for v in raw.values()):
+        # Match get_type_hints(): a bare None annotation means NoneType
+        return {k: type(None) if v is None else v for k, v in raw.items()}
+
+    try:
+        return typing.get_type_hints(fn)
+    except Exception:
+        # Fall back to raw annotations (e.g. for locally-defined classes)
+        if sig is None:
+            sig = inspect.signature(fn)
+        hints = {
+            name: param.annotation
+            for name, param in sig.parameters.items()
+            if param.annotation is not inspect.Parameter.empty
+        }
+        if sig.return_annotation is not inspect.Signature.empty:
+            hints["return"] = sig.return_annotation
+        return hints
+
+
+def _typed_dict_hints(cls: type) -> dict[str, Any]:
+    """Resolved field annotations of a TypedDict, including inherited fields.
+
+    Same fast path as _get_type_hints(): the class's own merged
+    ``__annotations__`` are used when nothing needs resolving.
+    """
+    raw = cls.__annotations__
+    if not any(_needs_resolution(v) for v in raw.values()):
+        return raw
+    return typing.get_type_hints(cls)
 
 
-def _return_type_to_schema(fn: Callable) -> dict[str, Any] | None:
+def _return_type_to_schema(fn: Callable, hints: dict[str, Any] | None = None) -> dict[str, Any] | None:
     """Extract a JSON schema from a function's return type annotation.
 
     Returns None for unstructured types (plain dict, list, primitives, Any, no annotation)
     that aren't useful for chaining. Returns a schema dict for structured types
     (TypedDict, Pydantic, list[TypedDict], etc.).
+
+    Pass ``hints`` when the function's type hints are already resolved.
     """
-    try:
-        hints = typing.get_type_hints(fn)
-    except Exception:
-        sig = inspect.signature(fn)
-        if sig.return_annotation is not inspect.Signature.empty:
-            hints = {"return": sig.return_annotation}
-        else:
-            return None
+    if hints is None:
+        hints = _get_type_hints(fn)
 
     ret = hints.get("return")
-    if ret is None or ret is inspect.Signature.empty:
-        return None
-
-    # Skip unstructured types
-    if ret is Any:
-        return None
-    if ret in (dict, list, str, int, float, bool):
-        return None
+    try:
+        if ret in _TRIVIAL_RETURN_ANNOTATIONS:
+            return None
+    except TypeError:
+        pass  # Unhashable annotation (e.g. Annotated[int, {...}])
 
     origin = get_origin(ret)
     args = get_args(ret)
@@ -292,6 +428,14 @@ def _return_type_to_schema(fn: Callable) -> dict[str, Any] | None:
     return None
 
 
+_JSON_TO_PY_TYPE = {
+    "string": "str",
+    "integer": "int",
+    "number": "float",
+    "boolean": "bool",
+}
+
+
 def _schema_to_type_str(schema: dict[str, Any]) -> str:
     """Convert a JSON schema to a compact Python-dict-like type string.
 
@@ -302,31 +446,35 @@ def _schema_to_type_str(schema: dict[str, Any]) -> str:
         {"type": "array", "items": {"type": "object", "properties": ...}}
         → "list[{...}]"
     """
-    type_map = {
-        "string": "str",
-        "integer": "int",
-        "number": "float",
-        "boolean": "bool",
-    }
-
-    schema_type = schema.get("type")
-
-    if schema_type == "object" and "properties" in schema:
-        parts = []
-        for key, prop in schema["properties"].items():
-            parts.append(f"{key}: {_schema_to_type_str(prop)}")
-        return "{" + ", ".join(parts) + "}"
-
-    if schema_type == "array":
-        items = schema.get("items")
-        if items:
-            return f"list[{_schema_to_type_str(items)}]"
-        return "list"
+    # Iterative expansion: the stack holds literal fragments (str) and
+    # sub-schemas still to expand (dict), popped in output order.
+    out: list[str] = []
+    stack: list[str | dict[str, Any]] = [schema]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            out.append(node)
+            continue
 
-    if schema_type in type_map:
-        return type_map[schema_type]
+        schema_type = node.get("type")
+
+        if schema_type == "object" and "properties" in node:
+            pending: list[str | dict[str, Any]] = ["{"]
+            for i, (key, prop) in enumerate(node["properties"].items()):
+                pending.append(f"{', ' if i else ''}{key}: ")
+                pending.append(prop)
+            pending.append("}")
+            stack.extend(reversed(pending))
+        elif schema_type == "array":
+            items = node.get("items")
+            if items:
+                stack.extend(("]", items, "list["))
+            else:
+                out.append("list")
+        else:
+            out.append(_JSON_TO_PY_TYPE.get(schema_type, "Any"))
 
-    return "Any"
+    return "".join(out)
 
 
 def format_return_schema(schema: dict[str, Any]) -> str:
@@ -337,6 +485,10 @@ def format_return_schema(schema: dict[str, Any]) -> str:
     return f"Returns: {_schema_to_type_str(schema)}"
 
 
+# Per-function schema memo; entries go away with the function object
+_FUNCTION_SCHEMAS: "weakref.WeakKeyDictionary[Callable, dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+
 def function_to_schema(fn: Callable) -> dict[str, Any]:
     """Extract a complete schema from a Python function.
 
@@ -345,22 +497,29 @@ def function_to_schema(fn: Callable) -> dict[str, Any]:
         - description: from docstring
         - parameters: JSON schema for the function's parameters
         - signature: human-readable function signature string
+
+    Schemas are memoized per function object, so decorating or registering
+    the same function again skips introspection. Each call returns a fresh copy.
     """
+    try:
+        cached = _FUNCTION_SCHEMAS.get(fn)
+    except TypeError:  # not weak-referenceable / unhashable — build uncached
+        return _build_function_schema(fn)
+    if cached is None:
+        cached = _build_function_schema(fn)
+        try:
+            _FUNCTION_SCHEMAS[fn] = cached
+        except TypeError:
+            return cached
+    return _clone_schema(cached)
+
+
+def _build_function_schema(fn: Callable) -> dict[str, Any]:
+    """Uncached implementation of function_to_schema()."""
     sig = inspect.signature(fn)
     description, param_docs = _parse_docstring(fn)
 
-    # Resolve string annotations from `from __future__ import annotations`
-    try:
-        hints = typing.get_type_hints(fn)
-    except Exception:
-        # Fall back to raw annotations (e.g. for locally-defined classes)
-        hints = {
-            name: param.annotation
-            for name, param in sig.parameters.items()
-            if param.annotation is not inspect.Parameter.empty
-        }
-        if sig.return_annotation is not inspect.Signature.empty:
-            hints["return"] = sig.return_annotation
+    hints = _get_type_hints(fn, sig)
 
     properties: dict[str, Any] = {}
     required: list[str] = []
@@ -372,14 +531,15 @@ def function_to_schema(fn: Callable) -> dict[str, Any]:
         if name in ("self", "cls"):
             continue
 
-        prop: dict[str, Any] = {}
-
         # Get resolved type annotation
         annotation = hints.get(name, inspect.Parameter.empty)
 
-        # Get type schema
+        # Get type schema. _type_to_schema() already returns a fresh dict
+        # owned by the caller, so it becomes the property schema as-is.
         if annotation is not inspect.Parameter.empty:
-            prop.update(_type_to_schema(annotation))
+            prop: dict[str, Any] = _type_to_schema(annotation)
+        else:
+            prop = {}
 
         # Add description from docstring
         if name in param_docs:
@@ -423,7 +583,7 @@ def function_to_schema(fn: Callable) -> dict[str, Any]:
     if required:
         schema["parameters"]["required"] = required
 
-    ret_schema = _return_type_to_schema(fn)
+    ret_schema = _return_type_to_schema(fn, hints)
     if ret_schema is not None:
         schema["return_schema"] = ret_schema
 
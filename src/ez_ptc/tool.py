@@ -3,14 +3,23 @@
 from __future__ import annotations
 
 import functools
-from dataclasses import dataclass
+import inspect
+from dataclasses import dataclass, field
 from typing import Any, Callable
 
-from .schema import function_to_schema
+from .schema import format_return_schema, function_to_schema
 
 
-@dataclass
-class Tool:
+class _ToolBase:
+    """Unslotted base that gives Tool instances a ``__dict__``.
+
+    Tool's fields live in slots, but functools.update_wrapper() copies the
+    wrapped function's metadata onto the instance.
+    """
+
+
+@dataclass(slots=True)
+class Tool(_ToolBase):
     """A wrapped function with metadata for use in a Toolkit.
 
     Attributes:
@@ -20,6 +29,8 @@ class Tool:
         fn: The actual callable function
         signature: Human-readable signature string
         return_schema: Optional JSON schema for the return type
+        cache: Reuse results for repeated calls with identical arguments
+            inside executed code. Only enable for pure tools.
     """
 
     name: str
@@ -30,6 +41,32 @@ class Tool:
     return_schema: dict[str, Any] | None = None
     is_async: bool = False
     requires_approval: bool = False
+    cache: bool = False
+    _call_cache: dict[tuple, Any] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @property
+    def prompt_block(self) -> str:
+        """``def signature:`` block with the indented docstring, as shown by ``Toolkit.prompt()``."""
+        sig = f"def {self.signature}:"
+        doc = inspect.getdoc(self.fn)
+        if not doc:
+            return sig
+        # Indent every line after the first (which follows the opening quotes)
+        indented = doc.strip().replace("\n", "\n    ")
+        return f'{sig}\n    """{indented}\n    """'
+
+    @property
+    def return_schema_text(self) -> str | None:
+        """``Returns: {...}`` summary of return_schema, or None if there is none."""
+        if self.return_schema is None:
+            return None
+        return format_return_schema(self.return_schema)
+
+    def clear_cache(self) -> None:
+        """Drop all cached results for this tool."""
+        self._call_cache.clear()
 
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
         return self.fn(*args, **kwargs)
@@ -43,6 +80,7 @@ def ez_tool(
     *,
     return_schema: dict[str, Any] | None = None,
     requires_approval: bool = False,
+    cache: bool = False,
 ) -> Tool | Callable[[Callable], Tool]:
     """Decorator that wraps a function as a Tool.
 
@@ -63,6 +101,11 @@ def ez_tool(
         def delete_file(path: str) -> str:
             \"\"\"Delete a file (requires human approval).\"\"\"
             ...
+
+        @ez_tool(cache=True)
+        def lookup_rate(currency: str) -> float:
+            \"\"\"Pure lookup — repeated calls with the same args reuse the result.\"\"\"
+            ...
     """
     def _wrap(f: Callable) -> Tool:
         schema = function_to_schema(f)
@@ -77,6 +120,7 @@ def ez_tool(
             return_schema=rs,
             is_async=schema.get("is_async", False),
             requires_approval=requires_approval,
+            cache=cache,
         )
         functools.update_wrapper(tool, f)
         return tool
@@ -2,20 +2,45 @@
 
 from __future__ import annotations
 
+import ast
 import asyncio
 import concurrent.futures
-import inspect
 import queue
-import re
+import textwrap
 import threading
-from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Literal
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Literal, Sequence
 
-from .executor import ExecutionEvent, ExecutionResult, PendingToolCall, ToolCallRecord
+from .executor import ExecutionEvent, ExecutionResult, PendingToolCall, ToolCallRecord, execute_code
 from .sandbox import LocalSandbox, SandboxBackend
-from .schema import format_return_schema
+from .schema import _clone_schema
 from .tool import Tool
 from .validator import validate_code
 
+# Fence openers recognised by Toolkit.extract_code(), in priority order
+_CODE_FENCES = ("```python", "```")
+
+
+def _find_fenced_block(text: str, fence: str) -> str | None:
+    """Return the body of the first ``fence``-opened block in text, or None.
+
+    Same matching as the regex ``fence + "\\s*\\n(.*?)```"`` with DOTALL: the
+    whitespace after the opener must contain a newline, the body starts after
+    the last newline in that run, and it ends at the next ``` anywhere.
+    """
+    n = len(text)
+    start = text.find(fence)
+    while start != -1:
+        ws_start = ws_end = start + len(fence)
+        while ws_end < n and text[ws_end].isspace():
+            ws_end += 1
+        newline = text.rfind("\n", ws_start, ws_end)
+        if newline != -1:
+            end = text.find("```", newline + 1)
+            # No closing fence here means none after any later opener either
+            return text[newline + 1:end] if end != -1 else None
+        start = text.find(fence, start + 1)
+    return None
+
 
 def _validation_error_result(errors: list[str], **kwargs: Any) -> ExecutionResult:
     """Build an ExecutionResult for a validation failure."""
@@ -32,46 +57,53 @@ def _find_called_tool_names(code: str, tool_names: set[str]) -> set[str]:
 
     Handles both direct calls like ``tool(args)`` and calls via ``parallel()``.
     """
-    import ast as _ast
-
     try:
-        tree = _ast.parse(code)
+        tree = ast.parse(code)
     except SyntaxError:
         return set()
 
     called: set[str] = set()
-    for node in _ast.walk(tree):
-        if isinstance(node, _ast.Call):
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
             # Direct call: tool_name(...)
-            if isinstance(node.func, _ast.Name) and node.func.id in tool_names:
+            if isinstance(node.func, ast.Name) and node.func.id in tool_names:
                 called.add(node.func.id)
             # parallel((tool_name, arg1), ...) — tool refs as first element of tuples
-            if isinstance(node.func, _ast.Name) and node.func.id == "parallel":
+            if isinstance(node.func, ast.Name) and node.func.id == "parallel":
                 for arg in node.args:
-                    if isinstance(arg, _ast.Starred) and isinstance(arg.value, (_ast.ListComp, _ast.GeneratorExp)):
+                    if isinstance(arg, ast.Starred) and isinstance(arg.value, (ast.ListComp, ast.GeneratorExp)):
                         elt = arg.value.elt
-                        if isinstance(elt, _ast.Tuple) and elt.elts:
+                        if isinstance(elt, ast.Tuple) and elt.elts:
                             first = elt.elts[0]
-                            if isinstance(first, _ast.Name) and first.id in tool_names:
+                            if isinstance(first, ast.Name) and first.id in tool_names:
                                 called.add(first.id)
-                    elif isinstance(arg, _ast.Tuple) and arg.elts:
+                    elif isinstance(arg, ast.Tuple) and arg.elts:
                         first = arg.elts[0]
-                        if isinstance(first, _ast.Name) and first.id in tool_names:
+                        if isinstance(first, ast.Name) and first.id in tool_names:
                             called.add(first.id)
     return called
 
 
 def _run_sync(coro: Awaitable[Any]) -> Any:
     """Run a coroutine synchronously, handling running event loops."""
-    try:
-        asyncio.get_running_loop()
-    except RuntimeError:
+    if asyncio._get_running_loop() is None:
         return asyncio.run(coro)
     # Already in async context — run in a new thread with its own loop
     with concurrent.futures.ThreadPoolExecutor(1) as pool:
         return pool.submit(asyncio.run, coro).result()
 
 
+# Instruction sentences shared by several prompt surfaces
+_MSG_RAW_PRINT = (
+    "Tool return schemas are not documented — do NOT access, index, or filter return values.\n"
+    "Only print() each raw result: print(tool_a(...)), print(tool_b(...))."
+)
+_MSG_RAW_PRINT_INDENTED = textwrap.indent(_MSG_RAW_PRINT, "    ")  # as_tool() docstring body
+_MSG_PARALLEL_NO_CALL = "Do NOT call the tools inside parallel() — pass the function and its arguments separately."
+_MSG_NO_ESCAPE = "No file I/O, networking, or shell access (os, subprocess, socket, etc. are blocked)."
+_MSG_ALWAYS_PRINT = "ALWAYS print() the final result you want to return."
+
+
 def _build_preamble(assist_tool_chaining: bool) -> str:
     """Build the default preamble based on configuration."""
     text = "You have access to the following tools via Python function calls. They are already available — do NOT import them."
@@ -96,26 +128,28 @@ def _build_postamble(assist_tool_chaining: bool) -> str:
             "Chain results: store tool outputs in variables, pass them to subsequent calls or conditions."
         )
     else:
-        lines.append(
-            "Tool return schemas are not documented — do NOT access, index, or filter return values.\n"
-            "Only print() each raw result: print(tool_a(...)), print(tool_b(...))."
-        )
+        lines.append(_MSG_RAW_PRINT)
     lines += [
         "For parallel execution, use the built-in parallel() helper:",
         "    a, b = parallel((tool1, arg1), (tool2, arg1, arg2))",
         "    results = parallel(*[(tool, id) for id in ids])  # batch pattern",
         "parallel() takes (callable, arg1, arg2, ...) tuples and runs them concurrently.",
         "Returns a list of results in the same order as the input tuples.",
-        "Do NOT call the tools inside parallel() — pass the function and its arguments separately.",
+        _MSG_PARALLEL_NO_CALL,
         "",
         "Environment: json, math, re are pre-imported. You can also import other standard library modules (collections, datetime, itertools, etc.).",
-        "Restrictions: No file I/O, networking, or shell access (os, subprocess, socket, etc. are blocked).",
+        f"Restrictions: {_MSG_NO_ESCAPE}",
         "",
-        "ALWAYS print() the final result you want to return.",
+        _MSG_ALWAYS_PRINT,
     ]
     return "\n".join(lines)
 
 
+# Default preamble/postamble, indexed by assist_tool_chaining
+_PREAMBLES = (_build_preamble(False), _build_preamble(True))
+_POSTAMBLES = (_build_postamble(False), _build_postamble(True))
+
+
 class Toolkit:
     """Groups tools and provides two modes of LLM integration.
 
@@ -126,13 +160,18 @@ class Toolkit:
     Mode 2 — Tool mode (native framework integration):
         toolkit.as_tool() → register with any framework
         → LLM calls meta-tool → ez-ptc executes → results
+
+    A Toolkit is immutable after construction: ``tools`` is stored as a
+    tuple (mutating the list passed in has no effect), so the rendered prompt
+    surfaces (``prompt()``, ``tool_prompt()``, ``as_tool()``,
+    ``tool_schema()``) are built once and reused on subsequent calls.
     """
 
     _DEFAULT_ERROR_HINT = "If execution returns an error, analyze the traceback, fix your code, and try again."
 
     def __init__(
         self,
-        tools: list[Tool],
+        tools: Sequence[Tool],
         preamble: str | None = None,
         postamble: str | None = None,
         assist_tool_chaining: bool = False,
@@ -141,22 +180,29 @@ class Toolkit:
         error_hint: str | None = None,
         on_tool_call: Callable[[ToolCallRecord], None] | None = None,
     ) -> None:
-        for item in tools:
-            if not isinstance(item, Tool):
+        self._assist_tool_chaining = assist_tool_chaining
+        self._chain_idx = 1 if assist_tool_chaining else 0  # index into _PREAMBLES/_POSTAMBLES
+        # Validate, index, and describe the tools in a single pass. Descriptors
+        # are (signature, description, return schema text) per tool — the one
+        # source every tool listing (tool_prompt, as_tool, tool_schema) formats from.
+        self.tools: tuple[Tool, ...] = tuple(tools)
+        self._tool_map: dict[str, Tool] = {}
+        self._tool_descriptors: list[tuple[str, str, str | None]] = []
+        for t in self.tools:
+            if not isinstance(t, Tool):
                 raise TypeError(
-                    f"Expected Tool instance, got {type(item).__name__}. Did you forget @ez_tool?"
+                    f"Expected Tool instance, got {type(t).__name__}. Did you forget @ez_tool?"
                 )
-        self.tools = tools
-        self._tool_map: dict[str, Tool] = {}
-        for t in tools:
             if t.name in self._tool_map:
                 raise ValueError(
                     f"Duplicate tool name '{t.name}'. Each tool in a Toolkit must have a unique name."
                 )
             self._tool_map[t.name] = t
+            self._tool_descriptors.append(
+                (t.signature, t.description or "No description", self._return_schema_text(t))
+            )
         self._custom_preamble = preamble
         self._custom_postamble = postamble
-        self._assist_tool_chaining = assist_tool_chaining
         self._timeout = timeout
         self._sandbox: SandboxBackend = sandbox or LocalSandbox()
         self._custom_error_hint = error_hint
@@ -165,11 +211,23 @@ class Toolkit:
         self._tools_needing_approval = frozenset(
             name for name, tool in self._tool_map.items() if tool.requires_approval
         )
+        # Rendered prompt surfaces, populated lazily. A Toolkit's tools and
+        # settings are fixed after construction, so these never go stale.
+        self._prompt_cache: str | None = None
+        self._tool_prompt_cache: str | None = None
+        self._as_tool_doc_cache: str | None = None
+        self._schema_cache: dict[str, dict[str, Any]] = {}
+        self._listing_lines_cache: list[str] | None = None
 
     def get_tool(self, name: str) -> Tool:
         """Look up a tool by name. Raises KeyError if not found."""
         return self._tool_map[name]
 
+    def clear_cache(self) -> None:
+        """Drop cached results of every ``cache=True`` tool in this toolkit."""
+        for tool in self.tools:
+            tool.clear_cache()
+
     def __iter__(self):
         return iter(self.tools)
 
@@ -184,7 +242,7 @@ class Toolkit:
     def _preamble(self) -> str:
         if self._custom_preamble is not None:
             return self._custom_preamble
-        return _build_preamble(self._assist_tool_chaining)
+        return _PREAMBLES[self._chain_idx]
 
     @property
     def _error_hint(self) -> str:
@@ -194,24 +252,28 @@ class Toolkit:
 
     @property
     def _postamble(self) -> str:
-        base = self._custom_postamble if self._custom_postamble is not None else _build_postamble(self._assist_tool_chaining)
+        base = self._custom_postamble if self._custom_postamble is not None else _POSTAMBLES[self._chain_idx]
         if self._error_hint:
             base += "\n" + self._error_hint
         return base
 
     def _return_schema_text(self, tool: Tool) -> str | None:
         """Return formatted return schema string for a tool, or None."""
-        if not self._assist_tool_chaining or tool.return_schema is None:
-            return None
-        return format_return_schema(tool.return_schema)
+        return tool.return_schema_text if self._chain_idx else None
 
     def _tool_listing_lines(self) -> list[str]:
-        """Build tool listing lines used by tool_prompt, as_tool, and tool_schema."""
+        """Tool listing lines used by tool_prompt.
+
+        Built once and shared; callers must not mutate the returned list.
+        """
+        if self._listing_lines_cache is None:
+            self._listing_lines_cache = self._build_tool_listing_lines()
+        return self._listing_lines_cache
+
+    def _build_tool_listing_lines(self) -> list[str]:
         lines = []
-        for tool in self.tools:
-            desc = tool.description or "No description"
-            ret_text = self._return_schema_text(tool)
-            line = f"- {tool.signature}\n  {desc}"
+        for sig, desc, ret_text in self._tool_descriptors:
+            line = f"- {sig}\n  {desc}"
             if ret_text:
                 line += f"\n  # {ret_text}"
             lines.append(line)
@@ -227,22 +289,19 @@ class Toolkit:
         - Tool signatures with docstrings
         - Postamble (instructions for the LLM)
         """
+        if self._prompt_cache is None:
+            self._prompt_cache = self._build_prompt()
+        return self._prompt_cache
+
+    def _build_prompt(self) -> str:
         if not self.tools:
             return "No tools are available."
 
         parts = [self._preamble, "", "Available tools:", ""]
 
-        for tool in self.tools:
-            # Build the function signature block
-            sig = f"def {tool.signature}:"
-            doc = inspect.getdoc(tool.fn)
-            if doc:
-                doc_lines = doc.strip().split("\n")
-                indented = "\n".join(f"    {line}" for line in doc_lines)
-                block = f'{sig}\n    """{indented.lstrip()}\n    """'
-            else:
-                block = sig
-            ret_text = self._return_schema_text(tool)
+        # Return-schema text is formatted once per toolkit, in _tool_descriptors
+        for tool, (_sig, _desc, ret_text) in zip(self.tools, self._tool_descriptors):
+            block = tool.prompt_block
             if ret_text:
                 block += f"\n    # {ret_text}"
             parts.append(block)
@@ -257,17 +316,11 @@ class Toolkit:
         Looks for ```python ... ``` fenced code blocks.
         Returns the first match, or None if no code block found.
         """
-        # Match ```python ... ``` blocks
-        pattern = r"```python\s*\n(.*?)```"
-        match = re.search(pattern, llm_response, re.DOTALL)
-        if match:
-            return match.group(1).strip()
-
-        # Also try generic ``` ... ``` blocks
-        pattern = r"```\s*\n(.*?)```"
-        match = re.search(pattern, llm_response, re.DOTALL)
-        if match:
-            return match.group(1).strip()
+        # Prefer ```python ... ``` blocks, then generic ``` ... ``` blocks
+        for fence in _CODE_FENCES:
+            block = _find_fenced_block(llm_response, fence)
+            if block is not None:
+                return block.strip()
 
         return None
 
@@ -281,6 +334,11 @@ class Toolkit:
         capabilities. Include this in your system prompt alongside the tool
         schema.
         """
+        if self._tool_prompt_cache is None:
+            self._tool_prompt_cache = self._build_tool_prompt()
+        return self._tool_prompt_cache
+
+    def _build_tool_prompt(self) -> str:
         parts = [
             "You have access to a code execution tool called `execute_tools`. "
             "Pass Python code in its `code` argument.\n"
@@ -302,26 +360,21 @@ class Toolkit:
                 "Each tool's return type is documented above — use these keys when accessing results."
             )
         else:
-            parts.append(
-                "Tool return schemas are not documented — do NOT access, index, or filter return values.\n"
-                "Only print() each raw result: print(tool_a(...)), print(tool_b(...))."
-            )
+            parts.append(_MSG_RAW_PRINT)
         parts.append(
             "For parallel execution, use the built-in parallel() helper: a, b = parallel((tool1, arg1), (tool2, arg1, arg2))\n"
             "Batch pattern: results = parallel(*[(tool, id) for id in ids])\n"
             "parallel() takes (callable, arg1, ...) tuples and runs them concurrently. Returns a list of results in order.\n"
-            "Do NOT call the tools inside parallel() — pass the function and its arguments separately."
+            + _MSG_PARALLEL_NO_CALL
         )
         parts.append(
             "json, math, re are pre-imported. You can also import other safe stdlib modules "
             "(collections, datetime, itertools, etc.)."
         )
-        parts.append(
-            "No file I/O, networking, or shell access (os, subprocess, socket, etc. are blocked)."
-        )
+        parts.append(_MSG_NO_ESCAPE)
         if self._error_hint:
             parts.append(self._error_hint)
-        parts.append("ALWAYS print() the final result you want to return.")
+        parts.append(_MSG_ALWAYS_PRINT)
         return "\n".join(parts)
 
     def as_tool(self) -> Callable[[str], Awaitable[str]]:
@@ -331,45 +384,10 @@ class Toolkit:
         - Accepts `code: str` — Python code to execute
         - Returns `str` — stdout on success, stderr/error on failure
         - Has proper type hints, docstring, and __name__ for framework introspection
-        """
-        # Build docstring listing all sub-tools
-        tool_docs = []
-        for tool in self.tools:
-            desc = tool.description or "No description"
-            ret_text = self._return_schema_text(tool)
-            line = f"    - {tool.signature}\n      {desc}"
-            if ret_text:
-                line += f" | {ret_text}"
-            tool_docs.append(line)
-        tools_listing = "\n\n".join(tool_docs)
-
-        if self._assist_tool_chaining:
-            usage_hint = "    Store results in variables to chain between function calls."
-        else:
-            usage_hint = (
-                "    Tool return schemas are not documented — do NOT access, index, or filter return values.\n"
-                "    Only print() each raw result: print(tool_a(...)), print(tool_b(...))."
-            )
-
-        parallel_hint = (
-            "    For parallel execution: a, b = parallel((tool1, arg1), (tool2, arg1, arg2))\n"
-            "    Batch pattern: results = parallel(*[(tool, id) for id in ids])\n"
-            "    Do NOT call tools inside parallel() — pass the function and its arguments separately."
-        )
-        error_line = f"    {self._error_hint}\n" if self._error_hint else ""
-        docstring = (
-            f"Execute Python code by passing it in the `code` argument.\n"
-            f"IMPORTANT: Combine ALL operations into a SINGLE code block — do NOT make separate calls.\n"
-            f"Inside the code, the following functions are already available — do NOT import them:\n\n"
-            f"{tools_listing}\n\n"
-            f"{usage_hint}\n"
-            f"{parallel_hint}\n"
-            f"{error_line}"
-            f"    ALWAYS print() the final result.\n\n"
-            f"    Args:\n"
-            f"        code: Python code to execute"
-        )
 
+        Each call returns a new function, so callers may set attributes on it
+        or wrap it freely; only the docstring is cached.
+        """
         toolkit_ref = self
 
         async def execute_tools(code: str) -> str:
@@ -388,12 +406,50 @@ class Toolkit:
                 )
             return result.to_string()
 
-        execute_tools.__name__ = "execute_tools"
-        execute_tools.__qualname__ = "execute_tools"
-        execute_tools.__doc__ = docstring
-        execute_tools.__annotations__ = {"code": str, "return": str}
+        return self._finish_as_tool(execute_tools)
+
+    def _finish_as_tool(self, fn: Callable) -> Callable:
+        """Give an execute_tools function its framework-facing metadata."""
+        fn.__name__ = "execute_tools"
+        fn.__qualname__ = "execute_tools"
+        if self._as_tool_doc_cache is None:
+            self._as_tool_doc_cache = self._build_as_tool_doc()
+        fn.__doc__ = self._as_tool_doc_cache
+        fn.__annotations__ = {"code": str, "return": str}
+        return fn
+
+    def _build_as_tool_doc(self) -> str:
+        # Build docstring listing all sub-tools, as fragments joined once
+        frags: list[str] = [
+            "Execute Python code by passing it in the `code` argument.\n"
+            "IMPORTANT: Combine ALL operations into a SINGLE code block — do NOT make separate calls.\n"
+            "Inside the code, the following functions are already available — do NOT import them:\n\n"
+        ]
+        for i, (sig, desc, ret_text) in enumerate(self._tool_descriptors):
+            if i:
+                frags.append("\n\n")
+            frags += ("    - ", sig, "\n      ", desc)
+            if ret_text:
+                frags += (" | ", ret_text)
+        frags.append("\n\n")
 
-        return execute_tools
+        if self._assist_tool_chaining:
+            frags.append("    Store results in variables to chain between function calls.\n")
+        else:
+            frags += (_MSG_RAW_PRINT_INDENTED, "\n")
+        frags.append(
+            "    For parallel execution: a, b = parallel((tool1, arg1), (tool2, arg1, arg2))\n"
+            "    Batch pattern: results = parallel(*[(tool, id) for id in ids])\n"
+            "    Do NOT call tools inside parallel() — pass the function and its arguments separately.\n"
+        )
+        if self._error_hint:
+            frags += ("    ", self._error_hint, "\n")
+        frags.append(
+            "    ALWAYS print() the final result.\n\n"
+            "    Args:\n"
+            "        code: Python code to execute"
+        )
+        return "".join(frags)
 
     def as_tool_sync(self) -> Callable[[str], str]:
         """Return a sync callable function that any framework can register as a tool.
@@ -403,8 +459,6 @@ class Toolkit:
         - Returns `str` — stdout on success, stderr/error on failure
         - Has proper type hints, docstring, and __name__ for framework introspection
         """
-        # Reuse as_tool() for docstring/metadata, then wrap sync
-        async_fn = self.as_tool()
         toolkit_ref = self
 
         def execute_tools(code: str) -> str:
@@ -423,12 +477,7 @@ class Toolkit:
                 )
             return result.to_string()
 
-        execute_tools.__name__ = async_fn.__name__
-        execute_tools.__qualname__ = async_fn.__qualname__
-        execute_tools.__doc__ = async_fn.__doc__
-        execute_tools.__annotations__ = async_fn.__annotations__
-
-        return execute_tools
+        return self._finish_as_tool(execute_tools)
 
     def tool_schema(self, format: Literal["openai", "anthropic", "gemini", "raw", "mistral"] = "openai") -> dict[str, Any]:
         """Return a tool definition dict in the specified provider format.
@@ -440,37 +489,44 @@ class Toolkit:
                 - 'gemini' — ``{"name": ..., "description": ..., "parameters": {...}}``
                 - 'raw' — same as gemini (bare JSON schema, no wrapper)
                 - 'mistral' — same as openai (Mistral uses OpenAI-compatible format)
+
+        The definition is built once per format; each call returns a fresh copy
+        that callers may modify (e.g. to add ``strict`` or ``cache_control``).
         """
-        # Build description with sub-tool listing
-        tool_lines = []
-        for tool in self.tools:
-            desc = tool.description or "No description"
-            ret_text = self._return_schema_text(tool)
-            line = f"- {tool.signature}: {desc}"
+        schema = self._schema_cache.get(format)
+        if schema is None:
+            schema = self._schema_cache[format] = self._build_schema(format)
+        return _clone_schema(schema)
+
+    def _build_schema(self, format: str) -> dict[str, Any]:
+        # Build description with sub-tool listing, as fragments joined once
+        frags: list[str] = [
+            "Execute Python code via the `code` argument. "
+            "Available functions inside the code (already available — do NOT import them):\n"
+        ]
+        for i, (sig, desc, ret_text) in enumerate(self._tool_descriptors):
+            if i:
+                frags.append("\n")
+            frags += ("- ", sig, ": ", desc)
             if ret_text:
-                line += f" | {ret_text}"
-            tool_lines.append(line)
-        tools_desc = "\n".join(tool_lines)
+                frags += (" | ", ret_text)
+        frags.append(
+            "\n\n"
+            "IMPORTANT: Combine ALL operations into a SINGLE code block — do NOT make multiple separate calls.\n"
+        )
 
         if self._assist_tool_chaining:
-            usage_hint = "Store results in variables to chain between function calls. print() the final result."
+            frags.append("Store results in variables to chain between function calls. print() the final result.\n")
         else:
-            usage_hint = (
-                "Tool return schemas are not documented — do NOT access, index, or filter return values.\n"
-                "Only print() each raw result: print(tool_a(...)), print(tool_b(...))."
-            )
-
-        description = (
-            f"Execute Python code via the `code` argument. "
-            f"Available functions inside the code (already available — do NOT import them):\n{tools_desc}\n\n"
-            f"IMPORTANT: Combine ALL operations into a SINGLE code block — do NOT make multiple separate calls.\n"
-            f"{usage_hint}\n"
-            f"For parallel execution: a, b = parallel((tool1, arg1), (tool2, arg1, arg2)). "
-            f"Batch pattern: results = parallel(*[(tool, id) for id in ids]). "
-            f"Do NOT call tools inside parallel() — pass the function and its arguments separately."
+            frags += (_MSG_RAW_PRINT, "\n")
+        frags.append(
+            "For parallel execution: a, b = parallel((tool1, arg1), (tool2, arg1, arg2)). "
+            "Batch pattern: results = parallel(*[(tool, id) for id in ids]). "
+            "Do NOT call tools inside parallel() — pass the function and its arguments separately."
         )
         if self._error_hint:
-            description += "\n" + self._error_hint
+            frags += ("\n", self._error_hint)
+        description = "".join(frags)
 
         code_desc = "Python code to execute. The listed functions are available as globals."
 
@@ -753,8 +809,6 @@ class Toolkit:
         self, code: str, loop: asyncio.AbstractEventLoop | None = None,
     ) -> tuple[threading.Thread, queue.Queue, list[ExecutionResult]]:
         """Shared setup for streaming: starts execution thread, returns (thread, queue, result_holder)."""
-        from .executor import execute_code
-
         event_queue: queue.Queue = queue.Queue()
         result_holder: list[ExecutionResult] = []
 
@@ -6,7 +6,7 @@ import ast
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationResult:
     """Result of static code validation.
 
@@ -0,0 +1,65 @@
+"""Decorated tools shared by the test modules.
+
+Decorating a function builds its schema, so the canonical tools are
+defined once here and imported wherever they are needed.
+"""
+
+from typing import TypedDict
+
+from ez_ptc import ez_tool
+
+
+@ez_tool
+def get_weather(location: str, unit: str = "celsius") -> dict:
+    """Get current weather for a location.
+
+    Args:
+        location: City and state, e.g. "San Francisco, CA"
+        unit: Temperature unit - "celsius" or "fahrenheit"
+    """
+    return {"temp": 22, "condition": "sunny", "unit": unit}
+
+
+@ez_tool
+def search_database(query: str, limit: int = 10) -> list[dict]:
+    """Search the product database.
+
+    Args:
+        query: Search query string
+        limit: Maximum number of results
+    """
+    return [{"id": i, "name": f"Product {i}", "price": 9.99} for i in range(limit)]
+
+
+# Tools with structured return types for chaining tests
+class WeatherResult(TypedDict):
+    location: str
+    temp: int
+    unit: str
+    condition: str
+
+
+class ProductResult(TypedDict):
+    id: int
+    name: str
+    price: float
+
+
+@ez_tool
+def get_weather_typed(location: str) -> WeatherResult:
+    """Get weather.
+
+    Args:
+        location: City name
+    """
+    return {"location": location, "temp": 22, "unit": "celsius", "condition": "sunny"}
+
+
+@ez_tool
+def search_products_typed(query: str) -> list[ProductResult]:
+    """Search products.
+
+    Args:
+        query: Search query
+    """
+    return [{"id": 1, "name": "Umbrella", "price": 24.99}]
@@ -2,12 +2,15 @@
 
 import asyncio
 
+import pytest
+
 from ez_ptc import ez_tool
 from ez_ptc.executor import ExecutionResult, execute_code
 
 
-def _make_tools():
-    """Create test tools."""
+@pytest.fixture(scope="module")
+def tools():
+    """Test tools, built once per module (the tests only call them)."""
 
     @ez_tool
     def get_weather(location: str) -> dict:
@@ -31,16 +34,14 @@ def _make_tools():
     return {"get_weather": get_weather, "search": search}
 
 
-def test_basic_execution():
-    tools = _make_tools()
+def test_basic_execution(tools):
     result = execute_code('print("hello")', tools)
     assert result.success
     assert result.output.strip() == "hello"
     assert result.error is None
 
 
-def test_tool_call():
-    tools = _make_tools()
+def test_tool_call(tools):
     code = """
 weather = get_weather("San Francisco")
 print(weather["condition"])
@@ -53,8 +54,7 @@ print(weather["condition"])
     assert result.tool_calls[0].args == ("San Francisco",)
 
 
-def test_multiple_tool_calls():
-    tools = _make_tools()
+def test_multiple_tool_calls(tools):
     code = """
 weather = get_weather("NYC")
 results = search("umbrellas", limit=3)
@@ -67,8 +67,7 @@ print(f"Weather: {weather['condition']}, Found: {len(results)}")
     assert len(result.tool_calls) == 2
 
 
-def test_tool_call_with_control_flow():
-    tools = _make_tools()
+def test_tool_call_with_control_flow(tools):
     code = """
 weather = get_weather("London")
 if weather["condition"] == "sunny":
@@ -82,8 +81,7 @@ print(f"Recommended {len(items)} items")
     assert "5" in result.output  # default limit is 5
 
 
-def test_error_handling():
-    tools = _make_tools()
+def test_error_handling(tools):
     code = """
 x = undefined_variable
 """
@@ -93,8 +91,7 @@ x = undefined_variable
     assert "undefined_variable" in result.error
 
 
-def test_tool_call_logging():
-    tools = _make_tools()
+def test_tool_call_logging(tools):
     code = """
 r1 = search("cats", limit=2)
 r2 = search("dogs", limit=3)
@@ -108,8 +105,7 @@ print("done")
     assert result.tool_calls[1].args == ("dogs",)
 
 
-def test_exception_in_code():
-    tools = _make_tools()
+def test_exception_in_code(tools):
     code = """
 raise ValueError("something went wrong")
 """
@@ -120,8 +116,7 @@ raise ValueError("something went wrong")
     assert "Traceback" in result.error_output
 
 
-def test_restricted_namespace():
-    tools = _make_tools()
+def test_restricted_namespace(tools):
     # Trying to import a blocked module should raise ImportError
     code = """
 import os
@@ -132,8 +127,7 @@ print(os.getcwd())
     assert "ImportError" in result.error
 
 
-def test_safe_builtins_available():
-    tools = _make_tools()
+def test_safe_builtins_available(tools):
     code = """
 items = list(range(5))
 print(len(items))
@@ -146,8 +140,7 @@ print(min(items), max(items))
     assert "[1, 2, 3]" in result.output
 
 
-def test_json_available():
-    tools = _make_tools()
+def test_json_available(tools):
     code = """
 data = json.dumps({"key": "value"})
 print(data)
@@ -157,8 +150,7 @@ print(data)
     assert '"key"' in result.output
 
 
-def test_timeout():
-    tools = _make_tools()
+def test_timeout(tools):
     code = """
 while True:
     pass
@@ -208,8 +200,7 @@ print(result)
     assert "tool broke" in result.error
 
 
-def test_positional_args():
-    tools = _make_tools()
+def test_positional_args(tools):
     code = """
 weather = get_weather("Paris")
 print(weather["temp"])
@@ -245,8 +236,7 @@ print(result)
 # ── Safe import tests ─────────────────────────────────────────────────
 
 
-def test_safe_import_math():
-    tools = _make_tools()
+def test_safe_import_math(tools):
     code = """
 import math
 print(math.sqrt(16))
@@ -256,8 +246,7 @@ print(math.sqrt(16))
     assert "4.0" in result.output
 
 
-def test_safe_import_re():
-    tools = _make_tools()
+def test_safe_import_re(tools):
     code = """
 import re
 m = re.match(r'(\\w+)', 'hello world')
@@ -268,8 +257,7 @@ print(m.group(1))
     assert "hello" in result.output
 
 
-def test_safe_import_datetime():
-    tools = _make_tools()
+def test_safe_import_datetime(tools):
     code = """
 import datetime
 d = datetime.date(2024, 1, 15)
@@ -280,8 +268,7 @@ print(d.isoformat())
     assert "2024-01-15" in result.output
 
 
-def test_safe_import_collections():
-    tools = _make_tools()
+def test_safe_import_collections(tools):
     code = """
 from collections import Counter
 c = Counter("abracadabra")
@@ -292,8 +279,7 @@ print(c.most_common(2))
     assert "a" in result.output
 
 
-def test_safe_import_urllib_parse():
-    tools = _make_tools()
+def test_safe_import_urllib_parse(tools):
     code = """
 from urllib.parse import urlencode
 print(urlencode({"q": "hello world"}))
@@ -306,8 +292,7 @@ print(urlencode({"q": "hello world"}))
 # ── Blocked import tests ─────────────────────────────────────────────
 
 
-def test_blocked_import_os():
-    tools = _make_tools()
+def test_blocked_import_os(tools):
     code = """
 import os
 """
@@ -316,8 +301,7 @@ import os
     assert "ImportError" in result.error
 
 
-def test_blocked_import_subprocess():
-    tools = _make_tools()
+def test_blocked_import_subprocess(tools):
     code = """
 import subprocess
 """
@@ -326,8 +310,7 @@ import subprocess
     assert "ImportError" in result.error
 
 
-def test_blocked_import_socket():
-    tools = _make_tools()
+def test_blocked_import_socket(tools):
     code = """
 import socket
 """
@@ -336,8 +319,7 @@ import socket
     assert "ImportError" in result.error
 
 
-def test_blocked_import_urllib_request():
-    tools = _make_tools()
+def test_blocked_import_urllib_request(tools):
     code = """
 from urllib.request import urlopen
 """
@@ -346,9 +328,8 @@ from urllib.request import urlopen
     assert "ImportError" in result.error
 
 
-def test_import_error_message():
+def test_import_error_message(tools):
     """Error message should list available modules for LLM self-correction."""
-    tools = _make_tools()
     code = """
 import os
 """
@@ -362,9 +343,8 @@ import os
 # ── Pre-injected modules tests ───────────────────────────────────────
 
 
-def test_pre_injected_modules():
+def test_pre_injected_modules(tools):
     """json, asyncio, math, re should be available without import."""
-    tools = _make_tools()
     code = """
 # All of these should work without import statements
 j = json.dumps({"x": 1})
@@ -379,9 +359,8 @@ print(f"{j} {m} {r.group()}")
     assert "hello" in result.output
 
 
-def test_asyncio_pre_injected():
+def test_asyncio_pre_injected(tools):
     """asyncio.run() should work without import."""
-    tools = _make_tools()
     code = """
 async def greet():
     return "hello async"
@@ -395,9 +374,8 @@ print(asyncio.run(greet()))
 # ── Async parallel execution tests ───────────────────────────────────
 
 
-def test_async_parallel_execution():
+def test_async_parallel_execution(tools):
     """asyncio.gather + asyncio.to_thread with tools should work."""
-    tools = _make_tools()
     code = """
 import asyncio
 
@@ -419,9 +397,8 @@ asyncio.run(main())
 # ── Expanded builtins tests ──────────────────────────────────────────
 
 
-def test_expanded_builtins():
+def test_expanded_builtins(tools):
     """New builtins should be available."""
-    tools = _make_tools()
     code = """
 # Data conversion
 print(repr("hello"))
@@ -454,9 +431,8 @@ print(type(bytearray(3)))
     assert "frozenset" in result.output
 
 
-def test_expanded_builtins_introspection():
+def test_expanded_builtins_introspection(tools):
     """dir, id, hash, super, etc. should be available."""
-    tools = _make_tools()
     code = """
 class Base:
     x = 1
@@ -474,9 +450,8 @@ print("x" in dir(Child))
     assert "True" in result.output
 
 
-def test_expanded_builtins_exceptions():
+def test_expanded_builtins_exceptions(tools):
     """New exception types should be available."""
-    tools = _make_tools()
     code = """
 exceptions = [
     AttributeError, RuntimeError, StopIteration, ImportError,
@@ -493,11 +468,10 @@ print(len(exceptions))
 # ── asyncio.run inside running event loop tests ──────────────────────
 
 
-def test_asyncio_run_inside_running_loop():
+def test_asyncio_run_inside_running_loop(tools):
     """asyncio.run() in LLM code should work even when called from within a running event loop."""
     import asyncio
 
-    tools = _make_tools()
     code = """
 async def main():
     result = get_weather("NYC")
@@ -600,9 +574,8 @@ def test_async_tool_return_value_capture():
     assert result.return_value == {"key": "test", "value": 42}
 
 
-def test_all_sync_tools_unchanged():
+def test_all_sync_tools_unchanged(tools):
     """Sync tools should work normally."""
-    tools = _make_tools()
     code = 'weather = get_weather("NYC")\nprint(weather["condition"])'
     result = execute_code(code, tools)
     assert result.success
@@ -612,9 +585,8 @@ def test_all_sync_tools_unchanged():
 # ── parallel() helper tests ────────────────────────────────────────────
 
 
-def test_parallel_helper_basic():
+def test_parallel_helper_basic(tools):
     """parallel() should run sync tools concurrently."""
-    tools = _make_tools()
     code = """
 a, b = parallel((get_weather, "NYC"), (get_weather, "LA"))
 print(f"a={a['condition']}, b={b['condition']}")
@@ -625,6 +597,32 @@ print(f"a={a['condition']}, b={b['condition']}")
     assert "b=sunny" in result.output
 
 
+def test_parallel_runs_whole_batch_concurrently():
+    """Every call in a batch runs at once, even beyond the default pool size."""
+    import threading
+
+    n = 24
+    barrier = threading.Barrier(n, timeout=5)
+
+    @ez_tool
+    def wait_for_all(i: int) -> int:
+        """Block until every call in the batch has started."""
+        barrier.wait()
+        return i
+
+    code = f"print(sum(parallel(*[(wait_for_all, i) for i in range({n})])))"
+    result = execute_code(code, {"wait_for_all": wait_for_all})
+    assert result.success, result.error
+    assert result.output.strip() == str(sum(range(n)))
+
+
+def test_parallel_single_call(tools):
+    result = execute_code('[r] = parallel((get_weather, "NYC"))\nr["temp"]', tools)
+    assert result.success, result.error
+    assert result.return_value == 22
+    assert len(result.tool_calls) == 1
+
+
 def test_parallel_with_async_tools():
     """parallel() should work with async tools (resolved via sync wrappers)."""
     tools = _make_async_tools()
@@ -652,9 +650,8 @@ def test_parallel_error_on_non_tuple():
 # ── Error enrichment tests ────────────────────────────────────────────
 
 
-def test_key_error_enrichment():
+def test_key_error_enrichment(tools):
     """KeyError should show available keys in the error output."""
-    tools = _make_tools()
     code = """
 result = get_weather("NYC")
 print(result["mileage"])
@@ -687,9 +684,8 @@ print(r["mileage"])
     assert "kmpl" in result.error_output
 
 
-def test_attribute_error_enrichment():
+def test_attribute_error_enrichment(tools):
     """AttributeError on a dict should hint about bracket syntax."""
-    tools = _make_tools()
     code = """
 result = get_weather("NYC")
 print(result.temp)
@@ -725,11 +721,10 @@ def test_no_enrichment_for_non_llm_errors():
 # ── ToolCallRecord tests ────────────────────────────────────────────
 
 
-def test_tool_call_record_fields():
+def test_tool_call_record_fields(tools):
     """ToolCallRecord should have name, args, kwargs, result, duration_ms."""
     from ez_ptc.executor import ToolCallRecord
 
-    tools = _make_tools()
     code = 'result = get_weather("NYC")\nprint(result)'
     result = execute_code(code, tools)
     assert result.success
@@ -764,12 +759,11 @@ def test_tool_call_record_timing():
     assert result.tool_calls[0].duration_ms >= 40  # at least 40ms
 
 
-def test_on_tool_call_callback():
+def test_on_tool_call_callback(tools):
     """on_tool_call should be invoked for each tool call."""
     from ez_ptc.executor import ToolCallRecord
 
     received = []
-    tools = _make_tools()
     code = """
 get_weather("NYC")
 search("test", limit=2)
@@ -782,9 +776,322 @@ search("test", limit=2)
     assert received[1].name == "search"
 
 
-def test_on_tool_call_none_is_fine():
+def test_on_tool_call_none_is_fine(tools):
     """on_tool_call=None should not cause errors."""
-    tools = _make_tools()
     code = 'get_weather("NYC")'
     result = execute_code(code, tools, on_tool_call=None)
     assert result.success
+
+
+# ── Compiled code cache tests ─────────────────────────────────────────
+
+
+def test_compiled_code_is_reused():
+    from ez_ptc.executor import _compile_code
+
+    code = "x = 1\nx + 1"
+    assert _compile_code(code) is _compile_code(code)
+
+
+def test_repeat_execution_gets_fresh_namespace(tools):
+    """Reusing a cached code object must not leak state between executions."""
+    code = """
+if "counter" not in dir():
+    counter = 0
+counter += 1
+print(counter)
+"""
+    first = execute_code(code, tools)
+    second = execute_code(code, tools)
+    assert first.output.strip() == "1"
+    assert second.output.strip() == "1"
+    assert len(execute_code('get_weather("NYC")', tools).tool_calls) == 1
+    assert len(execute_code('get_weather("NYC")', tools).tool_calls) == 1
+
+
+def test_long_code_bypasses_cache(tools):
+    from ez_ptc.executor import _CODE_CACHE_MAX_LEN
+
+    code = "x = 0\n" + "x += 1\n" * (_CODE_CACHE_MAX_LEN // 7 + 1) + "x"
+    assert len(code) > _CODE_CACHE_MAX_LEN
+    result = execute_code(code, tools)
+    assert result.success
+    assert result.return_value == _CODE_CACHE_MAX_LEN // 7 + 1
+
+
+def test_compile_time_syntax_error_reported():
+    """Errors raised by compile() (not ast.parse) still produce a clean result."""
+    result = execute_code("return 1", {})
+    assert not result.success
+    assert result.error.startswith("SyntaxError")
+
+
+# ── Tool result cache tests ─────────────────────────────────────────
+
+
+def _make_counting_tool(calls: list, **kw):
+    @ez_tool(cache=True, **kw)
+    def lookup(key, scale: int = 1) -> int:
+        """Look up a key."""
+        calls.append(key)
+        return len(str(key)) * scale
+
+    return lookup
+
+
+def test_cached_tool_reuses_result_within_run():
+    calls = []
+    lookup = _make_counting_tool(calls)
+    code = """
+a = lookup("abc")
+b = lookup("abc")
+c = lookup("abc", scale=2)
+print(a, b, c)
+"""
+    result = execute_code(code, {"lookup": lookup})
+    assert result.success
+    assert result.output.strip() == "3 3 6"
+    assert calls == ["abc", "abc"]
+    # Hits are still logged
+    assert len(result.tool_calls) == 3
+
+
+def test_cached_tool_reuses_result_across_runs():
+    calls = []
+    lookup = _make_counting_tool(calls)
+    execute_code('lookup("abc")', {"lookup": lookup})
+    result = execute_code('lookup("abc")', {"lookup": lookup})
+    assert result.return_value == 3
+    assert calls == ["abc"]
+
+    lookup.clear_cache()
+    execute_code('lookup("abc")', {"lookup": lookup})
+    assert calls == ["abc", "abc"]
+
+
+def test_cached_tool_unhashable_args_call_through():
+    calls = []
+    lookup = _make_counting_tool(calls)
+    result = execute_code('lookup([1, 2]); lookup([1, 2])', {"lookup": lookup})
+    assert result.success
+    assert len(calls) == 2
+    assert lookup._call_cache == {}
+
+
+def test_cached_tool_keys_on_argument_type():
+    calls = []
+
+    @ez_tool(cache=True)
+    def describe(value, flag=0) -> str:
+        """Describe a value."""
+        calls.append(value)
+        return f"{type(value).__name__}:{type(flag).__name__}"
+
+    code = "print(describe(1), describe(True), describe(1.0), describe(1, flag=False), describe(1))"
+    result = execute_code(code, {"describe": describe})
+    assert result.output.split() == ["int:int", "bool:int", "float:int", "int:bool", "int:int"]
+    assert calls == [1, True, 1.0, 1]
+
+
+def test_cached_tool_caches_none():
+    calls = []
+
+    @ez_tool(cache=True)
+    def maybe(key: str) -> None:
+        """Return nothing."""
+        calls.append(key)
+
+    execute_code('maybe("x"); maybe("x")', {"maybe": maybe})
+    assert calls == ["x"]
+
+
+def test_cached_async_tool_stores_awaited_result():
+    calls = []
+
+    @ez_tool(cache=True)
+    async def fetch(key: str) -> str:
+        """Fetch a key."""
+        calls.append(key)
+        await asyncio.sleep(0)
+        return key * 2
+
+    result = execute_code('print(fetch("ab"), fetch("ab"))', {"fetch": fetch})
+    assert result.success
+    assert result.output.strip() == "abab abab"
+    assert calls == ["ab"]
+
+
+def test_uncached_tool_always_calls_through():
+    calls = []
+
+    @ez_tool
+    def lookup(key: str) -> int:
+        """Look up a key."""
+        calls.append(key)
+        return 1
+
+    execute_code('lookup("a"); lookup("a")', {"lookup": lookup})
+    assert calls == ["a", "a"]
+    assert lookup._call_cache == {}
+
+
+def test_syntax_error_is_cached():
+    from ez_ptc.executor import _split_and_compile_cached
+
+    code = "def broken(:\n    pass"
+    first = execute_code(code, {})
+    hits = _split_and_compile_cached.cache_info().hits
+    second = execute_code(code, {})
+    assert _split_and_compile_cached.cache_info().hits == hits + 1
+    assert not first.success and not second.success
+    assert first.error == second.error
+    assert first.error.startswith("SyntaxError")
+
+
+def test_cached_syntax_error_raises_fresh_exception():
+    from ez_ptc.executor import _compile_code, _split_and_compile_cached
+
+    code = "if x:\nprint(1)"
+    raised = []
+    for _ in range(2):
+        with pytest.raises(IndentationError) as exc_info:
+            _compile_code(code)
+        raised.append(exc_info.value)
+    assert raised[0] is not raised[1]
+    assert str(raised[0]) == str(raised[1])
+    assert raised[0].lineno == raised[1].lineno == 2
+    # The cache holds the error's details, never an exception (or its traceback)
+    assert not isinstance(_split_and_compile_cached(code), BaseException)
+
+
+def test_traceback_line_numbers_match_source():
+    """Errors report the line as written, not as re-rendered by ast.unparse."""
+    result = execute_code("x = 1\n\n\ny = 1 / 0\nx", {})
+    assert not result.success
+    assert "line 4" in result.error_output
+
+
+def _make_deep_failing_tool():
+    from ez_ptc import Tool
+
+    def inner(key):
+        return {}[key]
+
+    def lookup(key: str) -> str:
+        return inner(key)
+
+    return {"lookup": Tool(name="lookup", description="", parameters={}, fn=lookup, signature="lookup(key)")}
+
+
+def test_traceback_compact_by_default():
+    result = execute_code("def f():\n    return lookup('k')\n\nf()", _make_deep_failing_tool())
+    assert not result.success
+    tb = result.error_output
+    assert tb.startswith("Traceback (most recent call last):")
+    assert 'File "<string>", line 2, in f' in tb
+    assert "in inner" in tb  # innermost frame kept
+    assert "in lookup" not in tb  # intermediate tool frames dropped
+    assert "in _run" not in tb and "in wrapper" not in tb
+    assert "KeyError: 'k'" in tb
+
+
+def test_traceback_full_when_requested():
+    result = execute_code(
+        "def f():\n    return lookup('k')\n\nf()",
+        _make_deep_failing_tool(),
+        full_traceback=True,
+    )
+    assert "in lookup" in result.error_output
+    assert "in inner" in result.error_output
+
+
+def test_builtins_mutation_does_not_leak():
+    first = execute_code('__builtins__["len"] = lambda x: -1\nlen([1])', {})
+    second = execute_code("len([1])", {})
+    assert first.return_value == -1
+    assert second.return_value == 1
+
+
+def test_streams_restored_after_execution():
+    import sys
+
+    before = sys.stdout, sys.stderr
+    execute_code('print("ok")', {})
+    execute_code("1 / 0", {})
+    assert (sys.stdout, sys.stderr) == before
+
+
+def test_sync_tool_returning_awaitable_is_resolved():
+    """Plain functions that hand back a coroutine still get awaited."""
+    from ez_ptc import Tool
+
+    async def _fetch(key):
+        await asyncio.sleep(0)
+        return key.upper()
+
+    tool = Tool(
+        name="fetch",
+        description="Fetch.",
+        parameters={},
+        fn=lambda key: _fetch(key),
+        signature="fetch(key)",
+    )
+    result = execute_code('fetch("ab")', {"fetch": tool})
+    assert result.success
+    assert result.return_value == "AB"
+
+
+# ── Thread-path worker reuse tests ──────────────────────────────────
+
+
+def _execute_off_main_thread(code, tools, timeout=30.0):
+    """Run execute_code from a non-main thread so it takes the thread path."""
+    import threading
+
+    box = []
+    t = threading.Thread(target=lambda: box.append(execute_code(code, tools, timeout=timeout)))
+    t.start()
+    t.join()
+    return box[0]
+
+
+def test_thread_path_reuses_worker_threads():
+    import threading
+
+    @ez_tool
+    def thread_id() -> int:
+        """Return the current thread id."""
+        return threading.get_ident()
+
+    tools = {"thread_id": thread_id}
+    first = _execute_off_main_thread("thread_id()", tools)
+    second = _execute_off_main_thread("thread_id()", tools)
+    assert first.success and second.success
+    assert first.return_value == second.return_value
+
+
+def test_thread_path_timeout_does_not_block_next_execution():
+    timed_out = _execute_off_main_thread("import time\ntime.sleep(1)", {}, timeout=0.2)
+    assert not timed_out.success
+    assert "timed out" in timed_out.error
+    after = _execute_off_main_thread("1 + 1", {}, timeout=5)
+    assert after.success
+    assert after.return_value == 2
+
+
+def test_cached_code_reused_across_tool_sets():
+    """Tools live in the namespace, so one compiled snippet serves any tool set."""
+
+    @ez_tool
+    def lookup(key: str) -> str:
+        """First implementation."""
+        return "first"
+
+    @ez_tool
+    def lookup_alt(key: str) -> str:
+        """Second implementation."""
+        return "second"
+
+    code = 'lookup("k")'
+    assert execute_code(code, {"lookup": lookup}).return_value == "first"
+    assert execute_code(code, {"lookup": lookup_alt}).return_value == "second"
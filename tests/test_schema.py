@@ -21,6 +21,7 @@ def test_basic_types():
     assert props["age"] == {"type": "integer"}
     assert props["score"] == {"type": "number"}
     assert props["active"] == {"type": "boolean"}
+    assert not any("default" in prop for prop in props.values())
     assert schema["parameters"]["required"] == ["name", "age", "score", "active"]
 
 
@@ -236,6 +237,37 @@ def test_return_type_pydantic():
     assert "score" in schema["properties"]
 
 
+def test_pydantic_json_schema_generated_once():
+    from pydantic import BaseModel
+
+    calls = []
+
+    class Order(BaseModel):
+        id: int
+        total: float
+
+        @classmethod
+        def model_json_schema(cls, *args, **kwargs):
+            calls.append(cls)
+            return super().model_json_schema(*args, **kwargs)
+
+    class RushOrder(Order):
+        deadline: str
+
+    def fn(order: Order) -> Order:
+        ...
+
+    function_to_schema(fn)
+    _return_type_to_schema(fn)
+    schema = _type_to_schema(Order)
+    schema["properties"].clear()  # callers get a copy they may mutate
+    assert calls == [Order]
+    assert "total" in _type_to_schema(Order)["properties"]
+    # A subclass is its own cache key, never the parent's schema
+    assert "deadline" in _type_to_schema(RushOrder)["properties"]
+    assert calls == [Order, RushOrder]
+
+
 def test_return_type_plain_dict_returns_none():
     def fn(x: str) -> dict:
         ...
@@ -264,6 +296,20 @@ def test_return_type_no_annotation_returns_none():
     assert _return_type_to_schema(fn) is None
 
 
+def test_return_type_none_returns_none():
+    def fn(x: str) -> None:
+        ...
+
+    assert _return_type_to_schema(fn) is None
+
+
+def test_return_type_unhashable_annotation_returns_none():
+    def fn(x: str) -> Annotated[dict, {"unhashable": True}]:
+        ...
+
+    assert _return_type_to_schema(fn) is None
+
+
 def test_return_type_list_typed_dict():
     def fn(x: str) -> list[Product]:
         ...
@@ -312,6 +358,27 @@ def test_format_return_schema_list():
     assert result == "Returns: list[{id: int, name: str}]"
 
 
+def test_format_return_schema_nested():
+    schema = {
+        "type": "object",
+        "properties": {
+            "rows": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "tags": {"type": "array", "items": {"type": "string"}},
+                        "meta": {"type": "object"},
+                    },
+                },
+            },
+            "raw": {"type": "array"},
+        },
+    }
+    result = format_return_schema(schema)
+    assert result == "Returns: {rows: list[{tags: list[str], meta: Any}], raw: list}"
+
+
 # ── function_to_schema includes return_schema ────────────────────────
 
 
@@ -365,3 +432,221 @@ def test_async_function_is_async_true():
 
     schema = function_to_schema(fn)
     assert schema["is_async"] is True
+
+
+def test_shared_docstring_parsed_once():
+    from ez_ptc.schema import _parse_docstring_text
+
+    def make_tool():
+        def fn(city: str) -> str:
+            """Look up a city.
+
+            Args:
+                city: City name
+            """
+            ...
+
+        return fn
+
+    function_to_schema(make_tool())
+    misses = _parse_docstring_text.cache_info().misses
+    schema = function_to_schema(make_tool())
+    assert _parse_docstring_text.cache_info().misses == misses
+    assert schema["description"] == "Look up a city."
+    assert schema["parameters"]["properties"]["city"]["description"] == "City name"
+
+
+# ── Annotation memoization tests ─────────────────────────────────────
+
+
+class _Point(TypedDict):
+    x: int
+    y: int
+
+
+def test_type_to_schema_returns_independent_copies():
+    first = _type_to_schema(list[_Point])
+    first["items"]["properties"]["x"]["type"] = "mutated"
+    second = _type_to_schema(list[_Point])
+    assert second["items"]["properties"]["x"] == {"type": "integer"}
+
+
+def test_typed_dict_schema_built_once():
+    from ez_ptc.schema import _type_to_schema_cached
+
+    class _Size(TypedDict):
+        width: int
+        height: int
+
+    _type_to_schema(_Size)
+    misses = _type_to_schema_cached.cache_info().misses
+    _type_to_schema(_Size)
+    _type_to_schema(list[_Size])
+    # list[_Size] is a new key, but its _Size items come from the cache
+    assert _type_to_schema_cached.cache_info().misses == misses + 1
+
+
+def test_typed_dict_subclass_does_not_reuse_parent_schema():
+    class _Point3D(_Point):
+        z: int
+
+    _type_to_schema(_Point)
+    schema = _type_to_schema(_Point3D)
+    assert set(schema["properties"]) == {"x", "y", "z"}
+    assert schema["required"] == ["x", "y", "z"]
+    assert set(_type_to_schema(_Point)["properties"]) == {"x", "y"}
+
+
+def test_typed_dict_hints_fast_path_and_fallback():
+    from typing import NotRequired, Required
+
+    from ez_ptc.schema import _typed_dict_hints
+
+    assert _typed_dict_hints(_Point) is _Point.__annotations__
+
+    class _Tagged(TypedDict, total=False):
+        label: Required[str]
+        tags: NotRequired[list[str]]
+        origin: "_Point"
+
+    # Qualifiers are stripped and string annotations resolved
+    assert _typed_dict_hints(_Tagged) == {"label": str, "tags": list[str], "origin": _Point}
+    schema = _type_to_schema(_Tagged)
+    assert schema["properties"]["tags"] == {"type": "array", "items": {"type": "string"}}
+    assert schema["required"] == ["label"]
+
+
+def test_type_to_schema_union_order_not_conflated():
+    from typing import Union
+
+    # Union equality ignores order; the cache must not.
+    assert _type_to_schema(Union[int, str]) == {"type": "integer"}
+    assert _type_to_schema(Union[str, int]) == {"type": "string"}
+    assert _type_to_schema(list[str | int]) == {"type": "array", "items": {"type": "string"}}
+
+
+def test_format_annotation_union_order_not_conflated():
+    from ez_ptc.schema import _format_annotation
+
+    assert _format_annotation(int | str) == "int | str"
+    assert _format_annotation(str | int) == "str | int"
+
+
+def test_unhashable_annotation_still_converted():
+    from ez_ptc.schema import _format_annotation
+
+    annotation = Annotated[int, {"unit": "px"}]
+    assert _type_to_schema(annotation) == {"type": "integer"}
+    assert _format_annotation(annotation) == "int"
+
+
+# ── Type hint resolution tests ───────────────────────────────────────
+
+
+def test_concrete_annotations_skip_get_type_hints(monkeypatch):
+    import typing
+
+    def fail(*args, **kwargs):
+        raise AssertionError("get_type_hints should not be called")
+
+    monkeypatch.setattr(typing, "get_type_hints", fail)
+
+    def fn(name: str, tags: list[str] | None = None) -> None:
+        """Concrete annotations only."""
+
+    schema = function_to_schema(fn)
+    assert schema["parameters"]["properties"]["name"] == {"type": "string"}
+    assert schema["signature"] == "fn(name: str, tags: list[str] | None = None) -> NoneType"
+
+
+def test_string_and_annotated_hints_still_resolved():
+    def fn(count: "int", point: Annotated["_Point", "meta"]) -> Annotated[_Point, "meta"]:
+        """Needs resolution."""
+
+    schema = function_to_schema(fn)
+    props = schema["parameters"]["properties"]
+    assert props["count"] == {"type": "integer"}
+    assert props["point"]["properties"]["x"] == {"type": "integer"}
+    assert schema["return_schema"]["properties"]["y"] == {"type": "integer"}
+
+
+# ── Function schema memoization tests ────────────────────────────────
+
+
+def test_function_schema_memoized_per_function(monkeypatch):
+    from ez_ptc import schema as schema_mod
+
+    def fn(x: int) -> str:
+        """Do a thing.
+
+        Args:
+            x: The input
+        """
+
+    first = function_to_schema(fn)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("schema should come from the memo")
+
+    monkeypatch.setattr(schema_mod, "_build_function_schema", fail)
+    second = function_to_schema(fn)
+    assert second == first
+    # Fresh copy each time — mutating one result can't affect the next
+    assert second is not first
+    second["parameters"]["properties"]["x"]["type"] = "string"
+    assert function_to_schema(fn)["parameters"]["properties"]["x"] == {
+        "type": "integer",
+        "description": "The input",
+    }
+
+
+def test_function_schema_memo_does_not_keep_function_alive():
+    import gc
+    import weakref
+
+    from ez_ptc.schema import _FUNCTION_SCHEMAS
+
+    def fn(x: int) -> int:
+        """Temp."""
+
+    function_to_schema(fn)
+    ref = weakref.ref(fn)
+    del fn
+    gc.collect()
+    assert ref() is None
+    assert ref not in [weakref.ref(k) for k in _FUNCTION_SCHEMAS.keys()]
+
+
+def test_function_to_schema_resolves_hints_once(monkeypatch):
+    from ez_ptc import schema as schema_mod
+
+    calls = []
+    real = schema_mod._get_type_hints
+
+    def counting(fn, sig=None):
+        calls.append(fn)
+        return real(fn, sig)
+
+    monkeypatch.setattr(schema_mod, "_get_type_hints", counting)
+
+    def fn(x: "int") -> "WeatherResult":
+        """Forward references force full resolution."""
+
+    schema = function_to_schema(fn)
+    assert schema["return_schema"]["properties"]["temp"] == {"type": "integer"}
+    assert calls == [fn]
+
+
+def test_parameter_schemas_not_shared_between_functions():
+    def a(x: str, tags: list[str]) -> None:
+        """A."""
+
+    def b(x: str, tags: list[str]) -> None:
+        """B."""
+
+    props_a = function_to_schema(a)["parameters"]["properties"]
+    props_a["x"]["type"] = "mutated"
+    props_a["tags"]["items"]["type"] = "mutated"
+    props_b = function_to_schema(b)["parameters"]["properties"]
+    assert props_b["x"] == {"type": "string"}
+    assert props_b["tags"] == {"type": "array", "items": {"type": "string"}}
@@ -59,6 +59,21 @@ def test_tool_preserves_function_metadata():
     assert documented_func.__wrapped__ is not None
 
 
+def test_tool_fields_are_slotted():
+    import dataclasses
+
+    @ez_tool
+    def slotted(x: str) -> str:
+        """A slotted tool."""
+        return x
+
+    assert "name" in type(slotted).__slots__
+    assert "name" not in vars(slotted)  # fields live in slots, not __dict__
+    assert slotted.__name__ == "slotted"  # update_wrapper still applies
+    copy = dataclasses.replace(slotted, cache=True)
+    assert copy.cache and copy.prompt_block == slotted.prompt_block
+
+
 def test_tool_with_defaults():
     @ez_tool
     def search(query: str, limit: int = 10) -> list:
@@ -155,3 +170,69 @@ def test_ez_tool_explicit_overrides_auto():
         return {"location": location, "temp": 22, "unit": "celsius"}
 
     assert get_weather.return_schema is explicit_schema
+
+
+def test_ez_tool_cache_defaults_off():
+    @ez_tool
+    def ping() -> str:
+        """Ping."""
+        return "pong"
+
+    assert ping.cache is False
+    assert ping._call_cache == {}
+
+
+def test_ez_tool_cache_flag_and_clear():
+    @ez_tool(cache=True)
+    def lookup(key: str) -> str:
+        """Look up a key."""
+        return key.upper()
+
+    assert lookup.cache is True
+    lookup._call_cache[(("a",), ())] = "A"
+    lookup.clear_cache()
+    assert lookup._call_cache == {}
+
+
+def test_prompt_block():
+    @ez_tool
+    def greet(name: str) -> str:
+        """Greet someone.
+
+        Args:
+            name: Person's name
+        """
+        return f"Hello, {name}!"
+
+    assert greet.prompt_block == (
+        "def greet(name: str) -> str:\n"
+        '    """Greet someone.\n'
+        "    \n"
+        "    Args:\n"
+        "        name: Person's name\n"
+        '    """'
+    )
+
+
+def test_prompt_block_tracks_field_changes():
+    @ez_tool
+    def greet(name: str) -> str:
+        """Greet someone."""
+        return f"Hello, {name}!"
+
+    assert greet.prompt_block.endswith('"""Greet someone.\n    """')
+    assert greet.return_schema_text is None
+
+    def wave(name: str) -> str:
+        """Wave at someone."""
+        return name
+
+    greet.fn = wave
+    greet.return_schema = {"type": "object", "properties": {"ok": {"type": "boolean"}}}
+    assert greet.prompt_block.endswith('"""Wave at someone.\n    """')
+    assert greet.return_schema_text == "Returns: {ok: bool}"
+
+
+def test_prompt_block_without_docstring():
+    tool = Tool(name="noop", description="", parameters={}, fn=lambda: None, signature="noop()")
+    assert tool.prompt_block == "def noop():"
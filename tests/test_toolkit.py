@@ -1,85 +1,57 @@
 """Tests for toolkit.py — Toolkit class."""
 
-from typing import TypedDict
-
 import pytest
 
 from ez_ptc import ExecutionResult, Toolkit, ez_tool
 from ez_ptc.executor import ExecutionResult as ER
 from ez_ptc.sandbox import LocalSandbox
-
-
-@ez_tool
-def get_weather(location: str, unit: str = "celsius") -> dict:
-    """Get current weather for a location.
-
-    Args:
-        location: City and state, e.g. "San Francisco, CA"
-        unit: Temperature unit - "celsius" or "fahrenheit"
-    """
-    return {"temp": 22, "condition": "sunny", "unit": unit}
-
-
-@ez_tool
-def search_database(query: str, limit: int = 10) -> list[dict]:
-    """Search the product database.
-
-    Args:
-        query: Search query string
-        limit: Maximum number of results
-    """
-    return [{"id": i, "name": f"Product {i}", "price": 9.99} for i in range(limit)]
+from tests._shared_tools import (
+    get_weather,
+    get_weather_typed,
+    search_database,
+    search_products_typed,
+)
 
 
 def _make_toolkit(**kwargs):
     return Toolkit([get_weather, search_database], **kwargs)
 
 
-# Tools with structured return types for chaining tests
-class WeatherResult(TypedDict):
-    location: str
-    temp: int
-    unit: str
-    condition: str
+def _make_typed_toolkit(**kwargs):
+    return Toolkit([get_weather_typed, search_products_typed], **kwargs)
 
 
-class ProductResult(TypedDict):
-    id: int
-    name: str
-    price: float
+# Shared toolkits for tests that only read from them. A Toolkit is immutable
+# after construction, so one instance per configuration serves the module;
+# tests needing other settings build their own via the helpers above.
 
 
-@ez_tool
-def get_weather_typed(location: str) -> WeatherResult:
-    """Get weather.
+@pytest.fixture(scope="module")
+def toolkit():
+    return _make_toolkit()
 
-    Args:
-        location: City name
-    """
-    return {"location": location, "temp": 22, "unit": "celsius", "condition": "sunny"}
 
+@pytest.fixture(scope="module")
+def toolkit_chain():
+    return _make_toolkit(assist_tool_chaining=True)
 
-@ez_tool
-def search_products_typed(query: str) -> list[ProductResult]:
-    """Search products.
 
-    Args:
-        query: Search query
-    """
-    return [{"id": 1, "name": "Umbrella", "price": 24.99}]
+@pytest.fixture(scope="module")
+def typed_toolkit():
+    return _make_typed_toolkit()
 
 
-def _make_typed_toolkit(**kwargs):
-    return Toolkit([get_weather_typed, search_products_typed], **kwargs)
+@pytest.fixture(scope="module")
+def typed_toolkit_chain():
+    return _make_typed_toolkit(assist_tool_chaining=True)
 
 
 # ── Prompt mode tests ────────────────────────────────────────────────
 
 
 class TestPrompt:
-    def test_default_prompt(self):
-        tk = _make_toolkit()
-        prompt = tk.prompt()
+    def test_default_prompt(self, toolkit):
+        prompt = toolkit.prompt()
         assert "get_weather" in prompt
         assert "search_database" in prompt
         assert "Available tools:" in prompt
@@ -98,42 +70,35 @@ class TestPrompt:
         assert "Always return JSON." in prompt
         assert "print() the final result" not in prompt
 
-    def test_tool_docstrings_in_prompt(self):
-        tk = _make_toolkit()
-        prompt = tk.prompt()
+    def test_tool_docstrings_in_prompt(self, toolkit):
+        prompt = toolkit.prompt()
         assert "Get current weather" in prompt
         assert "Search the product database" in prompt
 
-    def test_default_prompt_mentions_imports(self):
-        tk = _make_toolkit()
-        prompt = tk.prompt()
+    def test_default_prompt_mentions_imports(self, toolkit):
+        prompt = toolkit.prompt()
         assert "json" in prompt
         assert "import" in prompt.lower()
 
-    def test_default_prompt_mentions_restrictions(self):
-        tk = _make_toolkit()
-        prompt = tk.prompt()
+    def test_default_prompt_mentions_restrictions(self, toolkit):
+        prompt = toolkit.prompt()
         assert "blocked" in prompt.lower() or "no file" in prompt.lower()
 
-    def test_default_prompt_mentions_parallel(self):
-        tk = _make_toolkit()
-        prompt = tk.prompt()
+    def test_default_prompt_mentions_parallel(self, toolkit):
+        prompt = toolkit.prompt()
         assert "parallel(" in prompt
 
-    def test_chaining_prompt_mentions_return_schema(self):
-        tk = _make_typed_toolkit(assist_tool_chaining=True)
-        prompt = tk.prompt()
+    def test_chaining_prompt_mentions_return_schema(self, typed_toolkit_chain):
+        prompt = typed_toolkit_chain.prompt()
         assert "# Returns:" in prompt
 
-    def test_no_chaining_prompt_no_schema_mention(self):
-        tk = _make_typed_toolkit(assist_tool_chaining=False)
-        prompt = tk.prompt()
+    def test_no_chaining_prompt_no_schema_mention(self, typed_toolkit):
+        prompt = typed_toolkit.prompt()
         assert "# Returns:" not in prompt
 
 
 class TestExtractCode:
-    def test_python_fence(self):
-        tk = _make_toolkit()
+    def test_python_fence(self, toolkit):
         response = '''Here's the code:
 
 ```python
@@ -142,26 +107,23 @@ print(weather)
 ```
 
 That should work!'''
-        code = tk.extract_code(response)
+        code = toolkit.extract_code(response)
         assert code is not None
         assert 'get_weather("SF")' in code
 
-    def test_generic_fence(self):
-        tk = _make_toolkit()
+    def test_generic_fence(self, toolkit):
         response = '''```
 print("hello")
 ```'''
-        code = tk.extract_code(response)
+        code = toolkit.extract_code(response)
         assert code == 'print("hello")'
 
-    def test_no_code_block(self):
-        tk = _make_toolkit()
+    def test_no_code_block(self, toolkit):
         response = "Just a regular text response with no code."
-        code = tk.extract_code(response)
+        code = toolkit.extract_code(response)
         assert code is None
 
-    def test_multiple_code_blocks(self):
-        tk = _make_toolkit()
+    def test_multiple_code_blocks(self, toolkit):
         response = '''First block:
 ```python
 x = 1
@@ -171,11 +133,23 @@ Second block:
 ```python
 y = 2
 ```'''
-        code = tk.extract_code(response)
+        code = toolkit.extract_code(response)
         assert code == "x = 1"  # Returns first match
 
-    def test_multiline_code(self):
-        tk = _make_toolkit()
+    def test_python_fence_preferred_over_earlier_generic_fence(self, toolkit):
+        response = '''Output looks like:
+```
+sunny, 22
+```
+
+Code:
+```python
+print(get_weather("SF"))
+```'''
+        code = toolkit.extract_code(response)
+        assert code == 'print(get_weather("SF"))'
+
+    def test_multiline_code(self, toolkit):
         response = '''```python
 weather = get_weather("NYC")
 if weather["condition"] == "sunny":
@@ -184,88 +158,85 @@ else:
     products = search_database("umbrellas")
 print(products)
 ```'''
-        code = tk.extract_code(response)
+        code = toolkit.extract_code(response)
         assert code is not None
         assert "if weather" in code
         assert "search_database" in code
 
+    def test_fence_opener_needs_newline(self, toolkit):
+        # "```pythonic" is not an opener; the generic fence below is used
+        response = "Some ```pythonic prose.\n```  \n  x = 1\n```"
+        assert toolkit.extract_code(response) == "x = 1"
+
+    def test_unclosed_fence(self, toolkit):
+        assert toolkit.extract_code("```python\nprint(1)\n") is None
+
 
 # ── Tool mode tests ──────────────────────────────────────────────────
 
 
 class TestAsTool:
-    def test_returns_callable(self):
-        tk = _make_toolkit()
-        fn = tk.as_tool()
+    def test_returns_callable(self, toolkit):
+        fn = toolkit.as_tool()
         assert callable(fn)
 
-    def test_function_metadata(self):
-        tk = _make_toolkit()
-        fn = tk.as_tool()
+    def test_function_metadata(self, toolkit):
+        fn = toolkit.as_tool()
         assert fn.__name__ == "execute_tools"
         assert fn.__annotations__ == {"code": str, "return": str}
         assert "get_weather" in fn.__doc__
         assert "search_database" in fn.__doc__
 
-    def test_sync_returns_callable(self):
-        tk = _make_toolkit()
-        fn = tk.as_tool_sync()
+    def test_sync_returns_callable(self, toolkit):
+        fn = toolkit.as_tool_sync()
         assert callable(fn)
 
-    def test_sync_function_metadata(self):
-        tk = _make_toolkit()
-        fn = tk.as_tool_sync()
+    def test_sync_function_metadata(self, toolkit):
+        fn = toolkit.as_tool_sync()
         assert fn.__name__ == "execute_tools"
         assert fn.__annotations__ == {"code": str, "return": str}
         assert "get_weather" in fn.__doc__
         assert "search_database" in fn.__doc__
 
-    def test_execution_success(self):
-        tk = _make_toolkit()
-        fn = tk.as_tool_sync()
+    def test_execution_success(self, toolkit):
+        fn = toolkit.as_tool_sync()
         result = fn('print("hello from tool mode")')
         assert "hello from tool mode" in result
 
-    def test_execution_with_tools(self):
-        tk = _make_toolkit()
-        fn = tk.as_tool_sync()
+    def test_execution_with_tools(self, toolkit):
+        fn = toolkit.as_tool_sync()
         result = fn('w = get_weather("SF")\nprint(w["condition"])')
         assert "sunny" in result
 
-    def test_execution_failure(self):
-        tk = _make_toolkit()
-        fn = tk.as_tool_sync()
+    def test_execution_failure(self, toolkit):
+        fn = toolkit.as_tool_sync()
         result = fn("x = undefined_var")
         assert "NameError" in result
 
     @pytest.mark.asyncio
-    async def test_async_execution_success(self):
-        tk = _make_toolkit()
-        fn = tk.as_tool()
+    async def test_async_execution_success(self, toolkit):
+        fn = toolkit.as_tool()
         result = await fn('print("hello async")')
         assert "hello async" in result
 
     @pytest.mark.asyncio
-    async def test_async_execution_with_tools(self):
-        tk = _make_toolkit()
-        fn = tk.as_tool()
+    async def test_async_execution_with_tools(self, toolkit):
+        fn = toolkit.as_tool()
         result = await fn('w = get_weather("SF")\nprint(w["condition"])')
         assert "sunny" in result
 
 
 class TestToolSchema:
-    def test_openai_format(self):
-        tk = _make_toolkit()
-        schema = tk.tool_schema()
+    def test_openai_format(self, toolkit):
+        schema = toolkit.tool_schema()
         assert schema["type"] == "function"
         assert schema["function"]["name"] == "execute_tools"
         assert "code" in schema["function"]["parameters"]["properties"]
         assert schema["function"]["parameters"]["required"] == ["code"]
         assert "get_weather" in schema["function"]["description"]
 
-    def test_anthropic_format(self):
-        tk = _make_toolkit()
-        schema = tk.tool_schema(format="anthropic")
+    def test_anthropic_format(self, toolkit):
+        schema = toolkit.tool_schema(format="anthropic")
         assert schema["name"] == "execute_tools"
         assert "code" in schema["input_schema"]["properties"]
         assert schema["input_schema"]["required"] == ["code"]
@@ -276,43 +247,49 @@ class TestToolSchema:
 
 
 class TestExecute:
-    def test_basic_execute(self):
-        tk = _make_toolkit()
-        result = tk.execute_sync('print("test")')
+    def test_basic_execute(self, toolkit):
+        result = toolkit.execute_sync('print("test")')
         assert result.success
         assert "test" in result.output
 
-    def test_execute_with_tools(self):
-        tk = _make_toolkit()
+    def test_execute_with_tools(self, toolkit):
         code = """
 weather = get_weather("Boston", unit="fahrenheit")
 products = search_database("coats", limit=3)
 print(f"Temp: {weather['temp']}, Products: {len(products)}")
 """
-        result = tk.execute_sync(code)
+        result = toolkit.execute_sync(code)
         assert result.success
         assert "22" in result.output
         assert "3" in result.output
         assert len(result.tool_calls) == 2
 
-    def test_execute_error(self):
-        tk = _make_toolkit()
-        result = tk.execute_sync("1/0")
+    def test_repeated_execute_reuses_compiled_code(self, toolkit):
+        from ez_ptc.executor import _split_and_compile_cached
+
+        code = 'print(get_weather("Oslo")["temp"])'
+        toolkit.execute_sync(code)
+        hits = _split_and_compile_cached.cache_info().hits
+        result = toolkit.execute_sync(code)
+        assert _split_and_compile_cached.cache_info().hits == hits + 1
+        assert result.success
+        assert result.output.strip() == "22"
+
+    def test_execute_error(self, toolkit):
+        result = toolkit.execute_sync("1/0")
         assert not result.success
         assert "ZeroDivisionError" in result.error
 
     @pytest.mark.asyncio
-    async def test_async_basic_execute(self):
-        tk = _make_toolkit()
-        result = await tk.execute('print("async test")')
+    async def test_async_basic_execute(self, toolkit):
+        result = await toolkit.execute('print("async test")')
         assert result.success
         assert "async test" in result.output
 
     @pytest.mark.asyncio
-    async def test_async_execute_with_tools(self):
-        tk = _make_toolkit()
+    async def test_async_execute_with_tools(self, toolkit):
         code = 'w = get_weather("NYC")\nprint(w["condition"])'
-        result = await tk.execute(code)
+        result = await toolkit.execute(code)
         assert result.success
         assert "sunny" in result.output
 
@@ -321,12 +298,11 @@ print(f"Temp: {weather['temp']}, Products: {len(products)}")
 
 
 class TestEndToEnd:
-    def test_prompt_mode_flow(self):
+    def test_prompt_mode_flow(self, toolkit):
         """Simulate the full prompt mode flow."""
-        tk = _make_toolkit()
 
         # 1. Generate prompt
-        prompt = tk.prompt()
+        prompt = toolkit.prompt()
         assert "get_weather" in prompt
 
         # 2. Simulate LLM response with code
@@ -344,25 +320,24 @@ print(f"Weather: {weather['condition']}, Found {len(products)} products")
 This code checks the weather and searches for appropriate products.'''
 
         # 3. Extract code
-        code = tk.extract_code(llm_response)
+        code = toolkit.extract_code(llm_response)
         assert code is not None
 
         # 4. Execute
-        result = tk.execute_sync(code)
+        result = toolkit.execute_sync(code)
         assert result.success
         assert "sunny" in result.output
         assert "3" in result.output
         assert len(result.tool_calls) == 2
 
-    def test_tool_mode_flow(self):
+    def test_tool_mode_flow(self, toolkit):
         """Simulate the full tool mode flow."""
-        tk = _make_toolkit()
 
         # 1. Get meta-tool (sync version for sync test)
-        execute_fn = tk.as_tool_sync()
+        execute_fn = toolkit.as_tool_sync()
 
         # 2. Get schema for framework registration
-        schema = tk.tool_schema()
+        schema = toolkit.tool_schema()
         assert schema["function"]["name"] == "execute_tools"
 
         # 3. Simulate LLM calling the tool
@@ -392,9 +367,8 @@ class TestAssistToolChaining:
         assert tk_off.as_tool().__doc__ == tk_default.as_tool().__doc__
         assert tk_off.tool_schema() == tk_default.tool_schema()
 
-    def test_prompt_includes_return_schema(self):
-        tk = _make_typed_toolkit(assist_tool_chaining=True)
-        prompt = tk.prompt()
+    def test_prompt_includes_return_schema(self, typed_toolkit_chain):
+        prompt = typed_toolkit_chain.prompt()
         assert "# Returns:" in prompt
         assert "location: str" in prompt
         assert "temp: int" in prompt
@@ -407,33 +381,28 @@ class TestAssistToolChaining:
         # for a plain dict return should not have a "# Returns: {" annotation.
         assert "# Returns: {" not in prompt
 
-    def test_as_tool_includes_return_schema(self):
-        tk = _make_typed_toolkit(assist_tool_chaining=True)
-        fn = tk.as_tool()
+    def test_as_tool_includes_return_schema(self, typed_toolkit_chain):
+        fn = typed_toolkit_chain.as_tool()
         assert "Returns:" in fn.__doc__
         assert "location: str" in fn.__doc__
 
-    def test_tool_schema_includes_return_schema(self):
-        tk = _make_typed_toolkit(assist_tool_chaining=True)
-        schema = tk.tool_schema()
+    def test_tool_schema_includes_return_schema(self, typed_toolkit_chain):
+        schema = typed_toolkit_chain.tool_schema()
         desc = schema["function"]["description"]
         assert "Returns:" in desc
         assert "location: str" in desc
 
-    def test_tool_schema_anthropic_includes_return_schema(self):
-        tk = _make_typed_toolkit(assist_tool_chaining=True)
-        schema = tk.tool_schema(format="anthropic")
+    def test_tool_schema_anthropic_includes_return_schema(self, typed_toolkit_chain):
+        schema = typed_toolkit_chain.tool_schema(format="anthropic")
         assert "Returns:" in schema["description"]
 
-    def test_prompt_list_return_schema(self):
-        tk = _make_typed_toolkit(assist_tool_chaining=True)
-        prompt = tk.prompt()
+    def test_prompt_list_return_schema(self, typed_toolkit_chain):
+        prompt = typed_toolkit_chain.prompt()
         # search_products_typed returns list[ProductResult]
         assert "list[{" in prompt
 
-    def test_chaining_disabled_no_return_info(self):
-        tk = _make_typed_toolkit(assist_tool_chaining=False)
-        prompt = tk.prompt()
+    def test_chaining_disabled_no_return_info(self, typed_toolkit):
+        prompt = typed_toolkit.prompt()
         assert "# Returns:" not in prompt
 
 
@@ -441,40 +410,34 @@ class TestAssistToolChaining:
 
 
 class TestToolPrompt:
-    def test_tool_prompt_mentions_execute_tools(self):
-        tk = _make_toolkit()
-        tp = tk.tool_prompt()
+    def test_tool_prompt_mentions_execute_tools(self, toolkit):
+        tp = toolkit.tool_prompt()
         assert "execute_tools" in tp
         assert "code" in tp
 
-    def test_tool_prompt_lists_tools(self):
-        tk = _make_toolkit()
-        tp = tk.tool_prompt()
+    def test_tool_prompt_lists_tools(self, toolkit):
+        tp = toolkit.tool_prompt()
         assert "get_weather" in tp
         assert "search_database" in tp
         assert "Get current weather" in tp
         assert "Search the product database" in tp
 
-    def test_tool_prompt_chaining_mentions_return_schema(self):
-        tk = _make_typed_toolkit(assist_tool_chaining=True)
-        tp = tk.tool_prompt()
+    def test_tool_prompt_chaining_mentions_return_schema(self, typed_toolkit_chain):
+        tp = typed_toolkit_chain.tool_prompt()
         assert "Returns:" in tp
         assert "location: str" in tp
 
-    def test_tool_prompt_no_chaining_no_return_schema(self):
-        tk = _make_typed_toolkit(assist_tool_chaining=False)
-        tp = tk.tool_prompt()
+    def test_tool_prompt_no_chaining_no_return_schema(self, typed_toolkit):
+        tp = typed_toolkit.tool_prompt()
         assert "# Returns:" not in tp
 
-    def test_tool_prompt_mentions_restrictions(self):
-        tk = _make_toolkit()
-        tp = tk.tool_prompt()
+    def test_tool_prompt_mentions_restrictions(self, toolkit):
+        tp = toolkit.tool_prompt()
         assert "blocked" in tp.lower() or "no file" in tp.lower()
         assert "os" in tp.lower()
 
-    def test_tool_prompt_mentions_pre_imported(self):
-        tk = _make_toolkit()
-        tp = tk.tool_prompt()
+    def test_tool_prompt_mentions_pre_imported(self, toolkit):
+        tp = toolkit.tool_prompt()
         assert "json" in tp
         assert "math" in tp
         assert "re" in tp
@@ -484,27 +447,23 @@ class TestToolPrompt:
 
 
 class TestSingleCallInstructions:
-    def test_tool_schema_mentions_single_call(self):
-        tk = _make_toolkit()
-        desc = tk.tool_schema()["function"]["description"]
+    def test_tool_schema_mentions_single_call(self, toolkit):
+        desc = toolkit.tool_schema()["function"]["description"]
         assert "SINGLE" in desc
         assert "do NOT" in desc
 
-    def test_as_tool_mentions_single_call(self):
-        tk = _make_toolkit()
-        doc = tk.as_tool().__doc__
+    def test_as_tool_mentions_single_call(self, toolkit):
+        doc = toolkit.as_tool().__doc__
         assert "SINGLE" in doc
         assert "do NOT" in doc
 
-    def test_tool_prompt_mentions_single_call(self):
-        tk = _make_toolkit()
-        tp = tk.tool_prompt()
+    def test_tool_prompt_mentions_single_call(self, toolkit):
+        tp = toolkit.tool_prompt()
         assert "SINGLE" in tp
         assert "do NOT" in tp
 
-    def test_default_postamble_mentions_single_call(self):
-        tk = _make_toolkit()
-        prompt = tk.prompt()
+    def test_default_postamble_mentions_single_call(self, toolkit):
+        prompt = toolkit.prompt()
         assert "Combine ALL operations into a single code block" in prompt
 
 
@@ -512,8 +471,7 @@ class TestSingleCallInstructions:
 
 
 class TestEdgeCases:
-    def test_extract_code_with_nested_backticks(self):
-        tk = _make_toolkit()
+    def test_extract_code_with_nested_backticks(self, toolkit):
         response = '''Here's the code:
 
 ```python
@@ -522,7 +480,7 @@ print(markdown_str)
 ```
 
 That should work!'''
-        code = tk.extract_code(response)
+        code = toolkit.extract_code(response)
         assert code is not None
         assert "markdown_str" in code
 
@@ -541,53 +499,45 @@ That should work!'''
 class TestChainingLanguageConditional:
     """Chaining language should only appear when assist_tool_chaining=True."""
 
-    def test_postamble_no_chain_when_disabled(self):
-        tk = _make_toolkit(assist_tool_chaining=False)
-        prompt = tk.prompt()
+    def test_postamble_no_chain_when_disabled(self, toolkit):
+        prompt = toolkit.prompt()
         assert "Chain results" not in prompt
         assert "do NOT access" in prompt
         assert "print(tool_a(...))" in prompt
 
-    def test_postamble_chains_when_enabled(self):
-        tk = _make_toolkit(assist_tool_chaining=True)
-        prompt = tk.prompt()
+    def test_postamble_chains_when_enabled(self, toolkit_chain):
+        prompt = toolkit_chain.prompt()
         assert "Chain results" in prompt
         assert "do NOT access" not in prompt
 
-    def test_tool_prompt_no_chain_when_disabled(self):
-        tk = _make_toolkit(assist_tool_chaining=False)
-        tp = tk.tool_prompt()
+    def test_tool_prompt_no_chain_when_disabled(self, toolkit):
+        tp = toolkit.tool_prompt()
         assert "Chain results" not in tp
         assert "do NOT access" in tp
         assert "print(tool_a(...))" in tp
 
-    def test_tool_prompt_chains_when_enabled(self):
-        tk = _make_toolkit(assist_tool_chaining=True)
-        tp = tk.tool_prompt()
+    def test_tool_prompt_chains_when_enabled(self, toolkit_chain):
+        tp = toolkit_chain.tool_prompt()
         assert "Chain results" in tp
         assert "do NOT access" not in tp
 
-    def test_as_tool_no_chain_when_disabled(self):
-        tk = _make_toolkit(assist_tool_chaining=False)
-        doc = tk.as_tool().__doc__
+    def test_as_tool_no_chain_when_disabled(self, toolkit):
+        doc = toolkit.as_tool().__doc__
         assert "chain between" not in doc.lower()
         assert "do NOT access" in doc
 
-    def test_as_tool_chains_when_enabled(self):
-        tk = _make_toolkit(assist_tool_chaining=True)
-        doc = tk.as_tool().__doc__
+    def test_as_tool_chains_when_enabled(self, toolkit_chain):
+        doc = toolkit_chain.as_tool().__doc__
         assert "chain between" in doc.lower()
         assert "do NOT access" not in doc
 
-    def test_tool_schema_no_chain_when_disabled(self):
-        tk = _make_toolkit(assist_tool_chaining=False)
-        desc = tk.tool_schema()["function"]["description"]
+    def test_tool_schema_no_chain_when_disabled(self, toolkit):
+        desc = toolkit.tool_schema()["function"]["description"]
         assert "chain between" not in desc.lower()
         assert "do NOT access" in desc
 
-    def test_tool_schema_chains_when_enabled(self):
-        tk = _make_toolkit(assist_tool_chaining=True)
-        desc = tk.tool_schema()["function"]["description"]
+    def test_tool_schema_chains_when_enabled(self, toolkit_chain):
+        desc = toolkit_chain.tool_schema()["function"]["description"]
         assert "chain between" in desc.lower()
         assert "do NOT access" not in desc
 
@@ -598,24 +548,20 @@ class TestChainingLanguageConditional:
 class TestDoNotImportTools:
     """All surfaces should tell the LLM not to import the available tools."""
 
-    def test_prompt_mentions_no_import(self):
-        tk = _make_toolkit()
-        prompt = tk.prompt()
+    def test_prompt_mentions_no_import(self, toolkit):
+        prompt = toolkit.prompt()
         assert "do NOT import" in prompt
 
-    def test_tool_prompt_mentions_no_import(self):
-        tk = _make_toolkit()
-        tp = tk.tool_prompt()
+    def test_tool_prompt_mentions_no_import(self, toolkit):
+        tp = toolkit.tool_prompt()
         assert "do NOT import" in tp
 
-    def test_as_tool_mentions_no_import(self):
-        tk = _make_toolkit()
-        doc = tk.as_tool().__doc__
+    def test_as_tool_mentions_no_import(self, toolkit):
+        doc = toolkit.as_tool().__doc__
         assert "do NOT import" in doc
 
-    def test_tool_schema_mentions_no_import(self):
-        tk = _make_toolkit()
-        desc = tk.tool_schema()["function"]["description"]
+    def test_tool_schema_mentions_no_import(self, toolkit):
+        desc = toolkit.tool_schema()["function"]["description"]
         assert "do NOT import" in desc
 
 
@@ -623,27 +569,23 @@ class TestDoNotImportTools:
 
 
 class TestValidation:
-    def test_errors_block_execution(self):
-        tk = _make_toolkit()
-        result = tk.execute_sync("import get_weather")
+    def test_errors_block_execution(self, toolkit):
+        result = toolkit.execute_sync("import get_weather")
         assert not result.success
         assert "Validation failed" in result.error
 
-    def test_warnings_in_output(self):
-        tk = _make_toolkit()
-        result = tk.execute_sync("x = ''.__class__\nprint('hi')", validate=True)
+    def test_warnings_in_output(self, toolkit):
+        result = toolkit.execute_sync("x = ''.__class__\nprint('hi')", validate=True)
         assert result.success
         assert "Validation warnings" in result.error_output
 
-    def test_validate_false_skips(self):
-        tk = _make_toolkit()
-        result = tk.execute_sync("import get_weather", validate=False)
+    def test_validate_false_skips(self, toolkit):
+        result = toolkit.execute_sync("import get_weather", validate=False)
         assert not result.success
         assert "ImportError" in result.error
 
-    def test_dangerous_attr_blocked(self):
-        tk = _make_toolkit()
-        result = tk.execute_sync("x = ''.__class__.__globals__")
+    def test_dangerous_attr_blocked(self, toolkit):
+        result = toolkit.execute_sync("x = ''.__class__.__globals__")
         assert not result.success
         assert "Validation failed" in result.error
         assert "__globals__" in result.error
@@ -653,9 +595,8 @@ class TestValidation:
 
 
 class TestTimeout:
-    def test_default_timeout_is_30(self):
-        tk = _make_toolkit()
-        assert tk._timeout == 30.0
+    def test_default_timeout_is_30(self, toolkit):
+        assert toolkit._timeout == 30.0
 
     def test_custom_timeout(self):
         tk = _make_toolkit(timeout=5.0)
@@ -687,9 +628,8 @@ class _RecordingSandbox:
 
 
 class TestSandboxBackend:
-    def test_default_is_local_sandbox(self):
-        tk = _make_toolkit()
-        assert isinstance(tk._sandbox, LocalSandbox)
+    def test_default_is_local_sandbox(self, toolkit):
+        assert isinstance(toolkit._sandbox, LocalSandbox)
 
     def test_custom_backend_used(self):
         recorder = _RecordingSandbox()
@@ -713,27 +653,23 @@ class TestErrorHint:
 
     # ── Default error hint in all four surfaces ──
 
-    def test_prompt_includes_error_recovery(self):
-        tk = _make_toolkit()
-        prompt = tk.prompt()
+    def test_prompt_includes_error_recovery(self, toolkit):
+        prompt = toolkit.prompt()
         assert "error" in prompt.lower()
         assert "try again" in prompt.lower()
 
-    def test_tool_prompt_includes_error_recovery(self):
-        tk = _make_toolkit()
-        tp = tk.tool_prompt()
+    def test_tool_prompt_includes_error_recovery(self, toolkit):
+        tp = toolkit.tool_prompt()
         assert "error" in tp.lower()
         assert "try again" in tp.lower()
 
-    def test_as_tool_docstring_includes_error_recovery(self):
-        tk = _make_toolkit()
-        doc = tk.as_tool().__doc__
+    def test_as_tool_docstring_includes_error_recovery(self, toolkit):
+        doc = toolkit.as_tool().__doc__
         assert "error" in doc.lower()
         assert "try again" in doc.lower()
 
-    def test_tool_schema_includes_error_recovery(self):
-        tk = _make_toolkit()
-        desc = tk.tool_schema()["function"]["description"]
+    def test_tool_schema_includes_error_recovery(self, toolkit):
+        desc = toolkit.tool_schema()["function"]["description"]
         assert "error" in desc.lower()
         assert "try again" in desc.lower()
 
@@ -759,26 +695,23 @@ class TestErrorHint:
 
     # ── Error prefix in tool responses ──
 
-    def test_as_tool_sync_error_prefix(self):
-        tk = _make_toolkit()
-        fn = tk.as_tool_sync()
+    def test_as_tool_sync_error_prefix(self, toolkit):
+        fn = toolkit.as_tool_sync()
         result = fn("x = undefined_var")
         assert result.startswith("ERROR:")
         assert "try again" in result.lower()
         assert "NameError" in result
 
     @pytest.mark.asyncio
-    async def test_as_tool_async_error_prefix(self):
-        tk = _make_toolkit()
-        fn = tk.as_tool()
+    async def test_as_tool_async_error_prefix(self, toolkit):
+        fn = toolkit.as_tool()
         result = await fn("x = undefined_var")
         assert result.startswith("ERROR:")
         assert "try again" in result.lower()
         assert "NameError" in result
 
-    def test_as_tool_sync_success_no_prefix(self):
-        tk = _make_toolkit()
-        fn = tk.as_tool_sync()
+    def test_as_tool_sync_success_no_prefix(self, toolkit):
+        fn = toolkit.as_tool_sync()
         result = fn('print("hi")')
         assert not result.startswith("ERROR:")
         assert "hi" in result
@@ -790,36 +723,31 @@ class TestErrorHint:
 class TestNonChainingNoAccessPattern:
     """Non-chaining surfaces should forbid accessing return values and show print pattern."""
 
-    def test_prompt_has_no_access_when_disabled(self):
-        tk = _make_toolkit(assist_tool_chaining=False)
-        prompt = tk.prompt()
+    def test_prompt_has_no_access_when_disabled(self, toolkit):
+        prompt = toolkit.prompt()
         assert "do NOT access" in prompt
         assert "print(tool_a(...))" in prompt
 
-    def test_tool_prompt_has_no_access_when_disabled(self):
-        tk = _make_toolkit(assist_tool_chaining=False)
-        tp = tk.tool_prompt()
+    def test_tool_prompt_has_no_access_when_disabled(self, toolkit):
+        tp = toolkit.tool_prompt()
         assert "do NOT access" in tp
         assert "print(tool_a(...))" in tp
 
-    def test_as_tool_has_no_access_when_disabled(self):
-        tk = _make_toolkit(assist_tool_chaining=False)
-        doc = tk.as_tool().__doc__
+    def test_as_tool_has_no_access_when_disabled(self, toolkit):
+        doc = toolkit.as_tool().__doc__
         assert "do NOT access" in doc
         assert "print(tool_a(...))" in doc
 
-    def test_tool_schema_has_no_access_when_disabled(self):
-        tk = _make_toolkit(assist_tool_chaining=False)
-        desc = tk.tool_schema()["function"]["description"]
+    def test_tool_schema_has_no_access_when_disabled(self, toolkit):
+        desc = toolkit.tool_schema()["function"]["description"]
         assert "do NOT access" in desc
         assert "print(tool_a(...))" in desc
 
-    def test_no_access_absent_when_enabled(self):
-        tk = _make_toolkit(assist_tool_chaining=True)
-        assert "do NOT access" not in tk.prompt()
-        assert "do NOT access" not in tk.tool_prompt()
-        assert "do NOT access" not in tk.as_tool().__doc__
-        assert "do NOT access" not in tk.tool_schema()["function"]["description"]
+    def test_no_access_absent_when_enabled(self, toolkit_chain):
+        assert "do NOT access" not in toolkit_chain.prompt()
+        assert "do NOT access" not in toolkit_chain.tool_prompt()
+        assert "do NOT access" not in toolkit_chain.as_tool().__doc__
+        assert "do NOT access" not in toolkit_chain.tool_schema()["function"]["description"]
 
 
 # ── Empty output safety net tests ─────────────────────────────────────
@@ -828,42 +756,36 @@ class TestNonChainingNoAccessPattern:
 class TestEmptyOutputSafetyNet:
     """When chaining=False, tools called but nothing printed → corrective message."""
 
-    def test_sync_tools_called_no_print(self):
-        tk = _make_toolkit(assist_tool_chaining=False)
-        fn = tk.as_tool_sync()
+    def test_sync_tools_called_no_print(self, toolkit):
+        fn = toolkit.as_tool_sync()
         result = fn('get_weather("SF")')
         assert "No output captured" in result
 
     @pytest.mark.asyncio
-    async def test_async_tools_called_no_print(self):
-        tk = _make_toolkit(assist_tool_chaining=False)
-        fn = tk.as_tool()
+    async def test_async_tools_called_no_print(self, toolkit):
+        fn = toolkit.as_tool()
         result = await fn('get_weather("SF")')
         assert "No output captured" in result
 
-    def test_chaining_enabled_no_warning(self):
-        tk = _make_toolkit(assist_tool_chaining=True)
-        fn = tk.as_tool_sync()
+    def test_chaining_enabled_no_warning(self, toolkit_chain):
+        fn = toolkit_chain.as_tool_sync()
         result = fn('get_weather("SF")')
         assert "No output captured" not in result
 
-    def test_print_present_no_warning(self):
-        tk = _make_toolkit(assist_tool_chaining=False)
-        fn = tk.as_tool_sync()
+    def test_print_present_no_warning(self, toolkit):
+        fn = toolkit.as_tool_sync()
         result = fn('print(get_weather("SF"))')
         assert "No output captured" not in result
         assert "temp" in result
 
-    def test_no_tools_called_no_warning(self):
-        tk = _make_toolkit(assist_tool_chaining=False)
-        fn = tk.as_tool_sync()
+    def test_no_tools_called_no_warning(self, toolkit):
+        fn = toolkit.as_tool_sync()
         result = fn('x = 1 + 1')
         assert "No output captured" not in result
 
-    def test_print_in_code_but_empty_output_no_warning(self):
+    def test_print_in_code_but_empty_output_no_warning(self, toolkit):
         """If code contains print() but output is empty, don't fire safety net."""
-        tk = _make_toolkit(assist_tool_chaining=False)
-        fn = tk.as_tool_sync()
+        fn = toolkit.as_tool_sync()
         result = fn('w = get_weather("SF")\nprint(end="")')
         assert "No output captured" not in result
 
@@ -1042,22 +964,19 @@ print(f"a={a['key']}, b={b['key']}")
 class TestErrorEnrichment:
     """Tests for KeyError/AttributeError enrichment in error output."""
 
-    def test_key_error_shows_available_keys(self):
-        tk = _make_toolkit()
-        result = tk.execute_sync('r = get_weather("NYC")\nprint(r["mileage"])')
+    def test_key_error_shows_available_keys(self, toolkit):
+        result = toolkit.execute_sync('r = get_weather("NYC")\nprint(r["mileage"])')
         assert not result.success
         assert "Hint" in result.error_output
         assert "temp" in result.error_output or "condition" in result.error_output
 
-    def test_attribute_error_hints_dict_syntax(self):
-        tk = _make_toolkit()
-        result = tk.execute_sync('r = get_weather("NYC")\nprint(r.temp)')
+    def test_attribute_error_hints_dict_syntax(self, toolkit):
+        result = toolkit.execute_sync('r = get_weather("NYC")\nprint(r.temp)')
         assert not result.success
         assert "dict" in result.error_output
 
-    def test_enrichment_via_as_tool_sync(self):
-        tk = _make_toolkit()
-        fn = tk.as_tool_sync()
+    def test_enrichment_via_as_tool_sync(self, toolkit):
+        fn = toolkit.as_tool_sync()
         result = fn('r = get_weather("NYC")\nprint(r["mileage"])')
         assert "Hint" in result or "kmpl" in result or "temp" in result
 
@@ -1066,15 +985,13 @@ class TestErrorEnrichment:
 
 
 class TestGetTool:
-    def test_get_existing_tool(self):
-        tk = _make_toolkit()
-        tool = tk.get_tool("get_weather")
+    def test_get_existing_tool(self, toolkit):
+        tool = toolkit.get_tool("get_weather")
         assert tool.name == "get_weather"
 
-    def test_get_missing_tool_raises(self):
-        tk = _make_toolkit()
+    def test_get_missing_tool_raises(self, toolkit):
         with pytest.raises(KeyError):
-            tk.get_tool("nonexistent")
+            toolkit.get_tool("nonexistent")
 
 
 # ── on_tool_call callback tests ──────────────────────────────────────
@@ -1104,15 +1021,13 @@ class TestOnToolCallCallback:
 class TestFilter:
     """Tests for dynamic tool filtering via Toolkit.filter()."""
 
-    def test_filter_by_names(self):
-        tk = _make_toolkit()
-        filtered = tk.filter(names=["get_weather"])
+    def test_filter_by_names(self, toolkit):
+        filtered = toolkit.filter(names=["get_weather"])
         assert len(filtered) == 1
         assert filtered.tools[0].name == "get_weather"
 
-    def test_filter_by_names_multiple(self):
-        tk = _make_toolkit()
-        filtered = tk.filter(names=["get_weather", "search_database"])
+    def test_filter_by_names_multiple(self, toolkit):
+        filtered = toolkit.filter(names=["get_weather", "search_database"])
         assert len(filtered) == 2
 
     def test_filter_by_predicate(self):
@@ -1134,20 +1049,17 @@ class TestFilter:
         assert len(filtered) == 1
         assert filtered.tools[0].name == "async_fetch"
 
-    def test_filter_empty_raises_value_error(self):
-        tk = _make_toolkit()
+    def test_filter_empty_raises_value_error(self, toolkit):
         with pytest.raises(ValueError, match="empty"):
-            tk.filter(names=["nonexistent_tool"])
+            toolkit.filter(names=["nonexistent_tool"])
 
-    def test_filter_predicate_matches_none_raises(self):
-        tk = _make_toolkit()
+    def test_filter_predicate_matches_none_raises(self, toolkit):
         with pytest.raises(ValueError, match="empty"):
-            tk.filter(predicate=lambda t: t.is_async)
+            toolkit.filter(predicate=lambda t: t.is_async)
 
-    def test_filter_no_args_raises(self):
-        tk = _make_toolkit()
+    def test_filter_no_args_raises(self, toolkit):
         with pytest.raises(ValueError, match="At least one"):
-            tk.filter()
+            toolkit.filter()
 
     def test_filter_inherits_settings(self):
         tk = _make_toolkit(assist_tool_chaining=True, timeout=99.0, error_hint="Custom hint")
@@ -1162,38 +1074,33 @@ class TestFilter:
         assert "My preamble" in filtered.prompt()
         assert "My postamble" in filtered.prompt()
 
-    def test_filter_returns_new_toolkit(self):
-        tk = _make_toolkit()
-        filtered = tk.filter(names=["get_weather"])
-        assert filtered is not tk
-        assert len(tk) == 2
+    def test_filter_returns_new_toolkit(self, toolkit):
+        filtered = toolkit.filter(names=["get_weather"])
+        assert filtered is not toolkit
+        assert len(toolkit) == 2
         assert len(filtered) == 1
 
-    def test_filtered_prompt_only_has_selected_tools(self):
-        tk = _make_toolkit()
-        filtered = tk.filter(names=["get_weather"])
+    def test_filtered_prompt_only_has_selected_tools(self, toolkit):
+        filtered = toolkit.filter(names=["get_weather"])
         prompt = filtered.prompt()
         assert "get_weather" in prompt
         assert "search_database" not in prompt
 
-    def test_filtered_tool_schema(self):
-        tk = _make_toolkit()
-        filtered = tk.filter(names=["search_database"])
+    def test_filtered_tool_schema(self, toolkit):
+        filtered = toolkit.filter(names=["search_database"])
         schema = filtered.tool_schema()
         desc = schema["function"]["description"]
         assert "search_database" in desc
         assert "get_weather" not in desc
 
-    def test_filtered_execute(self):
-        tk = _make_toolkit()
-        filtered = tk.filter(names=["get_weather"])
+    def test_filtered_execute(self, toolkit):
+        filtered = toolkit.filter(names=["get_weather"])
         result = filtered.execute_sync('w = get_weather("NYC")\nprint(w["condition"])')
         assert result.success
         assert "sunny" in result.output
 
-    def test_filtered_execute_missing_tool(self):
-        tk = _make_toolkit()
-        filtered = tk.filter(names=["get_weather"])
+    def test_filtered_execute_missing_tool(self, toolkit):
+        filtered = toolkit.filter(names=["get_weather"])
         result = filtered.execute_sync('r = search_database("test")\nprint(r)')
         assert not result.success
 
@@ -1204,9 +1111,8 @@ class TestFilter:
 class TestToolSchemaFormats:
     """Tests for tool_schema() multi-model format support."""
 
-    def test_openai_format_structure(self):
-        tk = _make_toolkit()
-        schema = tk.tool_schema(format="openai")
+    def test_openai_format_structure(self, toolkit):
+        schema = toolkit.tool_schema(format="openai")
         assert schema["type"] == "function"
         assert "function" in schema
         assert schema["function"]["name"] == "execute_tools"
@@ -1214,18 +1120,16 @@ class TestToolSchemaFormats:
         assert "code" in schema["function"]["parameters"]["properties"]
         assert schema["function"]["parameters"]["required"] == ["code"]
 
-    def test_anthropic_format_structure(self):
-        tk = _make_toolkit()
-        schema = tk.tool_schema(format="anthropic")
+    def test_anthropic_format_structure(self, toolkit):
+        schema = toolkit.tool_schema(format="anthropic")
         assert "type" not in schema
         assert schema["name"] == "execute_tools"
         assert "input_schema" in schema
         assert "code" in schema["input_schema"]["properties"]
         assert schema["input_schema"]["required"] == ["code"]
 
-    def test_gemini_format_structure(self):
-        tk = _make_toolkit()
-        schema = tk.tool_schema(format="gemini")
+    def test_gemini_format_structure(self, toolkit):
+        schema = toolkit.tool_schema(format="gemini")
         assert "type" not in schema
         assert schema["name"] == "execute_tools"
         assert "description" in schema
@@ -1234,49 +1138,214 @@ class TestToolSchemaFormats:
         assert "code" in schema["parameters"]["properties"]
         assert schema["parameters"]["required"] == ["code"]
 
-    def test_gemini_has_tool_descriptions(self):
-        tk = _make_toolkit()
-        schema = tk.tool_schema(format="gemini")
+    def test_gemini_has_tool_descriptions(self, toolkit):
+        schema = toolkit.tool_schema(format="gemini")
         assert "get_weather" in schema["description"]
         assert "search_database" in schema["description"]
 
-    def test_raw_format_same_as_gemini(self):
-        tk = _make_toolkit()
-        gemini = tk.tool_schema(format="gemini")
-        raw = tk.tool_schema(format="raw")
+    def test_raw_format_same_as_gemini(self, toolkit):
+        gemini = toolkit.tool_schema(format="gemini")
+        raw = toolkit.tool_schema(format="raw")
         assert gemini == raw
 
-    def test_mistral_format_same_as_openai(self):
-        tk = _make_toolkit()
-        openai = tk.tool_schema(format="openai")
-        mistral = tk.tool_schema(format="mistral")
+    def test_mistral_format_same_as_openai(self, toolkit):
+        openai = toolkit.tool_schema(format="openai")
+        mistral = toolkit.tool_schema(format="mistral")
         assert openai == mistral
 
-    def test_gemini_no_function_wrapper(self):
-        tk = _make_toolkit()
-        schema = tk.tool_schema(format="gemini")
+    def test_gemini_no_function_wrapper(self, toolkit):
+        schema = toolkit.tool_schema(format="gemini")
         assert "function" not in schema
         assert "type" not in schema
 
-    def test_all_formats_have_same_description(self):
-        tk = _make_toolkit()
-        openai_desc = tk.tool_schema(format="openai")["function"]["description"]
-        anthropic_desc = tk.tool_schema(format="anthropic")["description"]
-        gemini_desc = tk.tool_schema(format="gemini")["description"]
-        mistral_desc = tk.tool_schema(format="mistral")["function"]["description"]
+    def test_all_formats_have_same_description(self, toolkit):
+        openai_desc = toolkit.tool_schema(format="openai")["function"]["description"]
+        anthropic_desc = toolkit.tool_schema(format="anthropic")["description"]
+        gemini_desc = toolkit.tool_schema(format="gemini")["description"]
+        mistral_desc = toolkit.tool_schema(format="mistral")["function"]["description"]
         assert openai_desc == anthropic_desc == gemini_desc == mistral_desc
 
-    def test_gemini_chaining_includes_return_schema(self):
-        tk = _make_typed_toolkit(assist_tool_chaining=True)
-        schema = tk.tool_schema(format="gemini")
+    def test_gemini_chaining_includes_return_schema(self, typed_toolkit_chain):
+        schema = typed_toolkit_chain.tool_schema(format="gemini")
         assert "Returns:" in schema["description"]
 
-    def test_raw_chaining_includes_return_schema(self):
-        tk = _make_typed_toolkit(assist_tool_chaining=True)
-        schema = tk.tool_schema(format="raw")
+    def test_raw_chaining_includes_return_schema(self, typed_toolkit_chain):
+        schema = typed_toolkit_chain.tool_schema(format="raw")
         assert "Returns:" in schema["description"]
 
-    def test_mistral_chaining_includes_return_schema(self):
-        tk = _make_typed_toolkit(assist_tool_chaining=True)
-        schema = tk.tool_schema(format="mistral")
+    def test_mistral_chaining_includes_return_schema(self, typed_toolkit_chain):
+        schema = typed_toolkit_chain.tool_schema(format="mistral")
         assert "Returns:" in schema["function"]["description"]
+
+
+# ── Construction validation tests ─────────────────────────────────────
+
+
+class TestToolkitValidation:
+    def test_rejects_non_tool(self):
+        def plain(x: str) -> str:
+            return x
+
+        with pytest.raises(TypeError, match="got function. Did you forget @ez_tool"):
+            Toolkit([get_weather, plain])
+
+    def test_reports_first_non_tool(self):
+        with pytest.raises(TypeError, match="got int"):
+            Toolkit([get_weather, 1, "two"])
+
+    def test_tools_stored_as_tuple(self):
+        tools = [get_weather]
+        tk = Toolkit(tools)
+        tools.append(search_database)
+        assert tk.tools == (get_weather,)
+        assert len(tk) == 1
+        assert "search_database" not in tk.tool_prompt()
+
+    def test_rejects_duplicate_names(self):
+        with pytest.raises(ValueError, match="Duplicate tool name 'get_weather'"):
+            Toolkit([get_weather, search_database, get_weather])
+
+
+# ── Prompt surface caching tests ───────────────────────────────────────
+
+
+class TestPromptCaching:
+    """Rendered prompt surfaces are built once per Toolkit and reused."""
+
+    def test_prompt_cached(self, toolkit):
+        assert toolkit.prompt() is toolkit.prompt()
+
+    def test_tool_prompt_cached(self, toolkit):
+        assert toolkit.tool_prompt() is toolkit.tool_prompt()
+
+    def test_as_tool_docstring_cached(self, toolkit):
+        assert toolkit.as_tool().__doc__ is toolkit.as_tool().__doc__
+        assert toolkit.as_tool_sync().__doc__ is toolkit.as_tool().__doc__
+
+    def test_as_tool_returns_fresh_function(self):
+        tk = _make_toolkit()
+        first = tk.as_tool()
+        first.__doc__ = "hacked"
+        first.__annotations__["extra"] = int
+        for fn in (tk.as_tool(), tk.as_tool_sync()):
+            assert fn is not first
+            assert fn.__doc__ != "hacked"
+            assert fn.__annotations__ == {"code": str, "return": str}
+
+    def test_tool_schema_built_once_per_format(self, monkeypatch):
+        tk = _make_toolkit()
+        calls = []
+        real = tk._build_schema
+        monkeypatch.setattr(tk, "_build_schema", lambda fmt: calls.append(fmt) or real(fmt))
+        tk.tool_schema()
+        tk.tool_schema(format="openai")
+        tk.tool_schema(format="anthropic")
+        tk.tool_schema(format="anthropic")
+        assert calls == ["openai", "anthropic"]
+
+    def test_tool_schema_returns_fresh_copy(self):
+        tk = _make_toolkit()
+        first = tk.tool_schema()
+        first["function"]["name"] = "x"
+        first["function"]["parameters"]["properties"]["code"]["extra"] = True
+        first["strict"] = True
+        second = tk.tool_schema()
+        assert second is not first
+        assert second["function"]["name"] == "execute_tools"
+        assert "extra" not in second["function"]["parameters"]["properties"]["code"]
+        assert "strict" not in second
+
+    def test_caches_are_per_instance(self):
+        basic = _make_typed_toolkit()
+        chained = _make_typed_toolkit(assist_tool_chaining=True)
+        assert "Returns:" not in basic.tool_prompt()
+        assert "Returns:" in chained.tool_prompt()
+        assert "Returns:" not in basic.tool_schema()["function"]["description"]
+        assert "Returns:" in chained.tool_schema()["function"]["description"]
+
+    def test_filtered_toolkit_has_fresh_cache(self, toolkit):
+        full = toolkit.tool_prompt()
+        filtered = toolkit.filter(names=["get_weather"])
+        assert "search_database" in full
+        assert "search_database" not in filtered.tool_prompt()
+
+    def test_listing_built_once_across_surfaces(self, monkeypatch):
+        import dataclasses
+
+        import ez_ptc.tool as tool_mod
+
+        calls = []
+        real = tool_mod.format_return_schema
+
+        def counting(schema):
+            calls.append(schema)
+            return real(schema)
+
+        monkeypatch.setattr(tool_mod, "format_return_schema", counting)
+        # Fresh Tool instances — formatted return schemas are cached per Tool
+        tools = [dataclasses.replace(t) for t in _make_typed_toolkit()]
+        tk = Toolkit(tools, assist_tool_chaining=True)
+        tk.tool_prompt()
+        tk.tool_schema(format="openai")
+        tk.tool_schema(format="anthropic")
+        tk.prompt()
+        n_typed = sum(1 for t in tools if t.return_schema is not None)
+        assert n_typed and len(calls) == n_typed
+        assert tk._tool_listing_lines() is tk._tool_listing_lines()
+
+        # Another toolkit renders from the tools' current fields
+        Toolkit(tools, assist_tool_chaining=True).tool_prompt()
+        assert len(calls) == 2 * n_typed
+
+    def test_surfaces_reflect_tool_changes_after_render(self):
+        import dataclasses
+
+        tool = dataclasses.replace(get_weather_typed)
+        tk = Toolkit([tool], assist_tool_chaining=True)
+        assert "Get weather." in tk.prompt()
+        assert "Get weather." in tk.tool_prompt()
+
+        def get_forecast(location: str) -> dict:
+            """Get the forecast."""
+            return {}
+
+        tool.description = "Get the forecast."
+        tool.fn = get_forecast
+        tool.return_schema = {"type": "object", "properties": {"high": {"type": "integer"}}}
+        fresh = Toolkit([tool], assist_tool_chaining=True)
+        for text in (fresh.prompt(), fresh.tool_prompt()):
+            assert "Get the forecast." in text
+            assert "Get weather." not in text
+            assert "Returns: {high: int}" in text
+
+
+# ── Tool result cache tests ────────────────────────────────────────────
+
+
+class TestToolResultCache:
+    """Toolkit-level access to per-tool result caches."""
+
+    def _make_cached(self, calls):
+        @ez_tool(cache=True)
+        def lookup(key: str) -> str:
+            """Look up a key."""
+            calls.append(key)
+            return key.upper()
+
+        return lookup
+
+    def test_cache_persists_across_executions(self):
+        calls = []
+        tk = Toolkit([self._make_cached(calls)])
+        tk.execute_sync('lookup("a")')
+        result = tk.execute_sync('print(lookup("a"))')
+        assert result.output.strip() == "A"
+        assert calls == ["a"]
+
+    def test_clear_cache(self):
+        calls = []
+        tk = Toolkit([self._make_cached(calls), get_weather])
+        tk.execute_sync('lookup("a")')
+        tk.clear_cache()
+        tk.execute_sync('lookup("a")')
+        assert calls == ["a", "a"]